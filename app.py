@@ -284,6 +284,10 @@ def get_enhanced_signals():
             # Get signals
             signals = query.order_by(desc(Signal.strength)).limit(limit).all()
             
+            # Market caps come from PriceService's cache where possible
+            from src.market_data import PriceService
+            price_service = PriceService()
+            
             # Enrich with additional data and apply filters
             result = []
             for sig in signals:
@@ -310,10 +314,7 @@ def get_enhanced_signals():
                 market_cap_value = None
                 market_cap_category = 'unknown'
                 try:
-                    import yfinance as yf
-                    ticker_obj = yf.Ticker(sig.ticker)
-                    info = ticker_obj.info
-                    market_cap_value = info.get('marketCap', 0)
+                    market_cap_value = price_service.get_market_cap(sig.ticker) or 0
                     
                     # Categorize market cap
                     if market_cap_value > 200_000_000_000:
@@ -95,6 +95,12 @@ class APIConfig:
     # FRED (economic data)
     FRED_API_KEY = os.getenv("FRED_API_KEY")
     FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+    
+    # ===== INSTITUTIONAL / OPTIONS FLOW =====
+    WHALE_WISDOM_API_KEY = os.getenv("WHALE_WISDOM_API_KEY")
+    QUANDL_API_KEY = os.getenv("QUANDL_API_KEY")
+    UNUSUAL_WHALES_API_KEY = os.getenv("UNUSUAL_WHALES_API_KEY")
+    FLOWALGO_API_KEY = os.getenv("FLOWALGO_API_KEY")
 
 
 @dataclass
@@ -109,6 +115,7 @@ class ScrapingConfig:
     # Data directories
     RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
     PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
+    CACHE_DIR = PROJECT_ROOT / "data" / "cache"  # On-disk HTTP response cache
     
     # Scraping intervals (hours)
     POLITICIAN_SCRAPE_INTERVAL = 6
@@ -224,4 +231,5 @@ config = Config()
 # Ensure data directories exist
 config.scraping.RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 config.scraping.PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+config.scraping.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 config.logging.LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -7,12 +7,34 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config.config import config
 from .models import Base
 
 logger = logging.getLogger(__name__)
 
 
+def _json_engine_kwargs() -> dict:
+    """JSON column (de)serializers for create_engine, using orjson when installed.
+    
+    Bulk inserts serialize raw_data for every row, and orjson is several
+    times faster than the stdlib json SQLAlchemy uses by default.
+    """
+    if not ORJSON_AVAILABLE:
+        return {}
+    
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    return {
+        "json_serializer": lambda value: orjson.dumps(value, default=str, option=options).decode(),
+        "json_deserializer": orjson.loads,
+    }
+
+
 class DatabaseManager:
     """Manages database connections and sessions."""
     
@@ -29,6 +51,8 @@ class DatabaseManager:
         
     def _initialize_engine(self):
         """Initialize SQLAlchemy engine and session factory."""
+        json_kwargs = _json_engine_kwargs()
+        
         # Engine configuration based on database type
         if self.database_url.startswith("sqlite"):
             # SQLite specific settings
@@ -39,7 +63,8 @@ class DatabaseManager:
                     "check_same_thread": False,
                     "timeout": 20
                 },
-                echo=config.web.DEBUG
+                echo=config.web.DEBUG,
+                **json_kwargs
             )
             # Enable foreign key constraints for SQLite
             @event.listens_for(self.engine, "connect")
@@ -56,13 +81,15 @@ class DatabaseManager:
                 pool_size=config.database.POOL_SIZE,
                 max_overflow=config.database.MAX_OVERFLOW,
                 pool_pre_ping=True,
-                echo=config.web.DEBUG
+                echo=config.web.DEBUG,
+                **json_kwargs
             )
         else:
             # Generic settings
             self.engine = create_engine(
                 self.database_url,
-                echo=config.web.DEBUG
+                echo=config.web.DEBUG,
+                **json_kwargs
             )
         
         # Create session factory
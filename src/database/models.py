@@ -88,6 +88,11 @@ class Filer(Base):
     # Relationships
     trades = relationship("Trade", back_populates="filer", lazy="dynamic")
     
+    # Indexes for performance (name leads, so name-only lookups use it too)
+    __table_args__ = (
+        Index("idx_filers_name_type", "name", "filer_type"),
+    )
+    
     def __repr__(self):
         return f"<Filer {self.name} ({self.filer_type.value})>"
     
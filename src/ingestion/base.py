@@ -1,20 +1,117 @@
 """Base classes for data ingestion."""
 
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
 import time
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any, Iterator
+from typing import BinaryIO, Callable, Dict, List, Optional, Any, Iterator
 from dataclasses import dataclass
+from urllib.parse import urlencode
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
 from config.config import config
 
 
 logger = logging.getLogger(__name__)
 
+# Connections kept alive per host by each ingester's HTTP session
+HTTP_POOL_SIZE = 16
+
+
+def response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed.
+    
+    orjson decodes from the raw bytes and is several times faster than the
+    stdlib json that ``response.json()`` uses on large payloads.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# simdjson parsers reuse their buffers and are not thread-safe, so keep one per thread
+_simdjson_local = threading.local()
+
+
+def response_json_lazy(response: requests.Response) -> Any:
+    """Parse a JSON response into lazy proxies that decode only the keys read.
+    
+    Suited to large feeds where only a few fields per item are used. With
+    pysimdjson the result is only valid until the next call on the same
+    thread, so copy out what you need before parsing another response.
+    Falls back to response_json() when pysimdjson is not installed.
+    """
+    if not SIMDJSON_AVAILABLE:
+        return response_json(response)
+    
+    parser = getattr(_simdjson_local, "parser", None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+    return parser.parse(response.content)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``, so
+    callers may burst up to capacity requests and are then held to the
+    sustained rate. Waiting callers reserve their token before sleeping, so
+    concurrent threads queue up in order instead of all waking at once.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """Initialize the bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the largest burst allowed
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+        
+        time.sleep(wait)
+        return wait
+
 
 class IngestionError(Exception):
     """Base exception for ingestion errors."""
@@ -31,9 +128,12 @@ class DataQualityError(IngestionError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class RawTradeData:
-    """Raw trade data before normalization."""
+    """Raw trade data before normalization.
+    
+    Slotted, as backfills hold and pass along very large numbers of these.
+    """
     
     source: str
     source_id: str
@@ -102,13 +202,23 @@ class BaseIngester(ABC):
             backoff_factor=1,
             raise_on_status=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Keep-alive pool sized for concurrent fetches against a single host
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry_strategy
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 1.0  # Minimum seconds between requests
+        self._rate_lock = threading.Lock()  # Serializes request starts across threads
+        
+        # On-disk HTTP response cache for _open_cached; ingesters that use it
+        # create the directory
+        self.cache_dir = config.scraping.CACHE_DIR / name
         
         # Statistics
         self.stats = {
@@ -120,16 +230,17 @@ class BaseIngester(ABC):
     
     def _rate_limit(self):
         """Implement rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            self.logger.debug(f"Rate limiting: sleeping {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                sleep_time = self.min_request_interval - elapsed
+                self.logger.debug(f"Rate limiting: sleeping {sleep_time:.2f} seconds")
+                time.sleep(sleep_time)
+            self.last_request_time = time.time()
     
     def _make_request(self, url: str, headers: Optional[Dict[str, str]] = None,
                       params: Optional[Dict[str, Any]] = None,
-                      timeout: int = 30) -> requests.Response:
+                      timeout: int = 30, stream: bool = False) -> requests.Response:
         """Make an HTTP request with rate limiting and error handling.
         
         Args:
@@ -137,6 +248,7 @@ class BaseIngester(ABC):
             headers: Optional headers
             params: Optional query parameters
             timeout: Request timeout in seconds
+            stream: Leave the body unread so it can be consumed from response.raw
             
         Returns:
             Response object
@@ -153,7 +265,8 @@ class BaseIngester(ABC):
                 url,
                 headers=headers or {},
                 params=params or {},
-                timeout=timeout
+                timeout=timeout,
+                stream=stream
             )
             
             # Check for rate limiting
@@ -168,6 +281,83 @@ class BaseIngester(ABC):
             self.logger.error(f"Request failed: {url} - {e}")
             raise IngestionError(f"Request failed: {e}")
     
+    def _open_cached(self, url: str, ttl: int, payload: Optional[Dict[str, Any]] = None,
+                     request: Optional[Callable[..., requests.Response]] = None) -> BinaryIO:
+        """Open the body of url from the on-disk cache, downloading on a miss.
+        
+        Bodies are streamed to a gzipped file under cache_dir and read back
+        from it, so even multi-MB documents are never held in memory whole.
+        Stale entries are revalidated with If-None-Match/If-Modified-Since,
+        so an unchanged document costs only a 304.
+        
+        Args:
+            url: URL to fetch
+            ttl: Seconds a cached copy stays fresh
+            payload: Form data sent with the request; part of the cache key
+            request: Called as request(url, headers, payload) to send a
+                streamed request; defaults to a GET through _make_request
+            
+        Returns:
+            Binary file object with the decompressed body
+        """
+        if request is None:
+            request = lambda url, headers, payload: self._make_request(url, headers=headers, stream=True)
+        
+        key = url if payload is None else f"{url}?{urlencode(sorted(payload.items()))}"
+        cache_path = self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.gz"
+        validators_path = cache_path.with_suffix(".json")
+        
+        headers = {}
+        try:
+            if time.time() - cache_path.stat().st_mtime < ttl:
+                return gzip.open(cache_path, 'rb')
+            
+            validators = json.loads(validators_path.read_text(encoding="utf-8"))
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        except (OSError, ValueError):
+            pass
+        
+        # Write to a temp file and rename so readers never see a partial entry
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with request(url, headers, payload) as response:
+                if response.status_code == 304:
+                    # Unchanged; the cached body is good for another ttl
+                    cache_path.touch()
+                    return gzip.open(cache_path, 'rb')
+                
+                response.raw.decode_content = True
+                with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                    shutil.copyfileobj(response.raw, f)
+            os.replace(tmp_path, cache_path)
+            
+            validators_path.write_text(json.dumps({
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }), encoding="utf-8")
+        except OSError as e:
+            self.logger.debug(f"Failed to cache {url}: {e}")
+            with request(url, {}, payload) as response:
+                return io.BytesIO(response.content)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        
+        return gzip.open(cache_path, 'rb')
+    
+    @staticmethod
+    def _load_json(f: BinaryIO) -> Any:
+        """Decode a JSON file, using orjson when it is installed.
+        
+        Large documents (e.g. SEC submissions files) decode several times
+        faster with orjson than with the stdlib json module.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.loads(f.read())
+        return json.load(f)
+    
     def _validate_trade_data(self, trade_data: RawTradeData) -> bool:
         """Validate trade data quality.
         
@@ -316,7 +506,7 @@ class APIIngester(BaseIngester):
     """Base class for API-based ingesters."""
     
     def __init__(self, name: str, base_url: str, api_key: Optional[str] = None,
-                 rate_limit: int = 60):
+                 rate_limit: int = 60, burst: int = 1):
         """Initialize API ingester.
         
         Args:
@@ -324,6 +514,7 @@ class APIIngester(BaseIngester):
             base_url: Base URL for the API
             api_key: API key if required
             rate_limit: Requests per minute
+            burst: Requests that may be sent back to back before the rate applies
         """
         super().__init__(name)
         self.base_url = base_url
@@ -331,11 +522,18 @@ class APIIngester(BaseIngester):
         
         # Set rate limiting based on API limits
         self.min_request_interval = 60.0 / rate_limit if rate_limit > 0 else 1.0
+        self.rate_limiter = TokenBucket(1.0 / self.min_request_interval, burst)
         
         # Set up authentication headers
         if api_key:
             self.session.headers.update({"Authorization": f"Bearer {api_key}"})
     
+    def _rate_limit(self):
+        """Wait for a token from the API's rate limiter."""
+        waited = self.rate_limiter.acquire()
+        if waited:
+            self.logger.debug(f"Rate limiting: waited {waited:.2f} seconds")
+    
     def _build_url(self, endpoint: str) -> str:
         """Build full URL for API endpoint."""
         return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
@@ -3,42 +3,134 @@
 import logging
 import re
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Iterator
+from typing import Dict, List, Optional, Iterator, Tuple
 from decimal import Decimal
+from functools import lru_cache
 import io
 
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import fitz  # PyMuPDF - C-backed, much faster for text-only extraction
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
 try:
     import pdfplumber
     PDFPLUMBER_AVAILABLE = True
 except ImportError:
     PDFPLUMBER_AVAILABLE = False
-    logging.warning("pdfplumber not available. Install with: pip install pdfplumber")
+
+PDF_PARSER_AVAILABLE = PYMUPDF_AVAILABLE or PDFPLUMBER_AVAILABLE
+if not PDF_PARSER_AVAILABLE:
+    logging.warning("No PDF parser available. Install with: pip install pymupdf (or pdfplumber)")
 
 from config.config import config
 from src.database import get_session, Filer, Trade, FilerType, TransactionType, DataSource
 from .base import ScrapingIngester, RawTradeData, IngestionError
 
+# Filer type recorded on every House PTR trade
+_POLITICIAN = FilerType.POLITICIAN.value
+
+# On-disk cache lifetime (seconds) for PTR PDFs, which never change once filed
+PDF_CACHE_TTL = 365 * 24 * 3600
+
+# Short all-caps words that appear in PTR asset lines but are never tickers
+_TICKER_STOPWORDS = frozenset({
+    'A', 'AN', 'THE', 'OF', 'AND', 'INC', 'LLC', 'CORP', 'CO', 'LP', 'LTD',
+    'PLC', 'USD', 'ETF'
+})
+_TICKER_PUNCT = '()[],.:;'
+
+# Patterns applied to every candidate trade line, compiled once
+_TXN_KEYWORD_RE = re.compile(r'purchase|sale|buy|sell|exchange', re.IGNORECASE)
+_DATE_RE = re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
+_AMOUNT_RANGE_RE = re.compile(r'\$[\d,]+\s*-\s*\$[\d,]+')
+_AMOUNT_RE = re.compile(r'\$([\d,]+)')
+_ASSET_RE = re.compile(r'([A-Z][a-zA-Z\s&\.]+(?:[A-Z][a-zA-Z\s&\.]+)*)')
+_AMOUNT_STRIP = str.maketrans('', '', '$,')
+
+# Table-row patterns
+_SELL_RE = re.compile(r'sell|sale', re.IGNORECASE)
+_TABLE_TICKER_RE = re.compile(r'\(([A-Z]{1,5})\)')
+_EMPTY_CELLS = frozenset({'none', 'n/a'})
+
+
+@lru_cache(maxsize=1024)
+def _parse_mdy(date_str: str) -> Optional[date]:
+    """Parse an M/D/Y or M-D-Y date (2- or 4-digit year), or return None.
+    
+    PTRs repeat the same dates across rows, so results are memoized, and the
+    fields are split and converted directly instead of going through strptime.
+    """
+    parts = date_str.strip().replace('-', '/').split('/')
+    if len(parts) != 3:
+        return None
+    
+    month, day, year = parts
+    try:
+        if len(year) == 2:
+            # Same pivot as strptime's %y
+            year = int(year)
+            year += 2000 if year < 69 else 1900
+        elif len(year) == 4:
+            year = int(year)
+        else:
+            return None
+        return date(year, int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _find_ticker(line: str) -> str:
+    """Return the first ticker-like token in a line, or '' if there is none."""
+    for token in line.split():
+        token = token.strip(_TICKER_PUNCT)
+        if (0 < len(token) <= 5 and token.isalpha() and token.isupper()
+                and token not in _TICKER_STOPWORDS):
+            return token
+    return ''
+
 
 class HousePDFScraper(ScrapingIngester):
     """Scraper for House of Representatives financial disclosure PDFs."""
     
-    def __init__(self):
+    def __init__(self, extract_tables: bool = False):
+        """Initialize the scraper.
+        
+        Args:
+            extract_tables: Also run pdfplumber table extraction. PTR fields are
+                captured by the text pass, so this is off by default and the
+                faster PyMuPDF text extraction is used when installed.
+        """
         super().__init__(
             name="house_pdf",
             base_url="https://disclosures-clerk.house.gov"
         )
         
-        if not PDFPLUMBER_AVAILABLE:
-            self.logger.warning("pdfplumber not installed - House PDF scraping will be limited")
+        self.extract_tables = extract_tables
+        
+        # Per-run string pool for names/tickers repeated across rows
+        self._interned: Dict[str, str] = {}
+        
+        # Filed PTR PDFs are immutable, so downloads are cached by URL
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        if not PDF_PARSER_AVAILABLE:
+            self.logger.warning("No PDF parser installed - House PDF scraping will be limited")
+        elif extract_tables and not PDFPLUMBER_AVAILABLE:
+            self.logger.warning("pdfplumber not installed - table extraction disabled")
     
     def fetch_recent_trades(self, days: int = 30) -> Iterator[RawTradeData]:
         """Fetch recent House trading disclosures from PDFs."""
         
-        # House Financial Disclosure search
-        search_url = f"{self.base_url}/FinancialDisclosure"
+        for trades in self._fetch_recent_filings(days):
+            yield from trades
+    
+    def _fetch_recent_filings(self, days: int) -> Iterator[List[RawTradeData]]:
+        """Fetch recent House PTR filings, yielding the parsed trades of each filing."""
         
         try:
             # Get list of recent PTR (Periodic Transaction Report) filings
@@ -46,9 +138,7 @@ class HousePDFScraper(ScrapingIngester):
             
             for filing in filings:
                 # Download and parse PDF
-                trades = self._parse_pdf_filing(filing)
-                for trade in trades:
-                    yield trade
+                yield self._parse_pdf_filing(filing)
                     
         except Exception as e:
             self.logger.error(f"Failed to fetch House filings: {e}")
@@ -125,38 +215,62 @@ class HousePDFScraper(ScrapingIngester):
         
         trades = []
         
-        if not PDFPLUMBER_AVAILABLE:
-            self.logger.warning("Cannot parse PDF - pdfplumber not installed")
+        if not PDF_PARSER_AVAILABLE:
+            self.logger.warning("Cannot parse PDF - no PDF parser installed")
             return trades
         
         try:
-            # Download PDF
-            response = self._make_request(filing['url'])
-            pdf_bytes = io.BytesIO(response.content)
+            # Download PDF (or load from cache) - both parsers read the raw bytes
+            with self._open_cached(filing['url'], PDF_CACHE_TTL) as f:
+                pdf_bytes = f.read()
             
-            # Parse PDF
-            with pdfplumber.open(pdf_bytes) as pdf:
-                for page in pdf.pages:
-                    # Extract text
-                    text = page.extract_text()
-                    
-                    if text:
-                        # Look for transaction tables
-                        page_trades = self._extract_trades_from_text(text, filing)
-                        trades.extend(page_trades)
-                    
-                    # Also try table extraction
-                    tables = page.extract_tables()
-                    for table in tables:
-                        if table:
-                            table_trades = self._extract_trades_from_table(table, filing)
-                            trades.extend(table_trades)
+            # Text-only fast path unless pdfplumber tables were requested
+            use_fitz = PYMUPDF_AVAILABLE and not (self.extract_tables and PDFPLUMBER_AVAILABLE)
+            
+            for text, tables in self._read_pages(pdf_bytes, use_fitz):
+                if text:
+                    # Look for transaction tables
+                    trades.extend(self._extract_trades_from_text(text, filing))
+                
+                # Also try table extraction
+                for table in tables:
+                    if table:
+                        trades.extend(self._extract_trades_from_table(table, filing))
             
         except Exception as e:
             self.logger.warning(f"Failed to parse PDF {filing['filename']}: {e}")
         
         return trades
     
+    def _read_pages(self, pdf_bytes: bytes, use_fitz: bool) -> Iterator[Tuple[str, List]]:
+        """Yield (text, tables) for every page, in page order.
+        
+        Pages are read sequentially from one document handle: PyMuPDF is not
+        thread-safe even with a document per thread, and pdfminer is pure
+        Python, so threads would gain nothing on that path.
+        """
+        
+        if use_fitz:
+            with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+                for page in doc:
+                    yield page.get_text('text'), []
+            return
+        
+        # pdfminer needs a seekable stream; BytesIO shares the bytes buffer
+        # rather than copying it.
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            for page in pdf.pages:
+                text = page.extract_text() or ''
+                
+                # Table extraction is the costly layout pass; cover and
+                # instruction pages without transaction wording skip it
+                tables = page.extract_tables() if _TXN_KEYWORD_RE.search(text) else []
+                yield text, tables
+    
+    def _intern(self, value: str) -> str:
+        """Return the pooled copy of a string so repeats share one object."""
+        return self._interned.setdefault(value, value)
+    
     def _extract_trades_from_text(self, text: str, filing: Dict) -> List[RawTradeData]:
         """Extract trades from PDF text using pattern matching."""
         
@@ -166,63 +280,55 @@ class HousePDFScraper(ScrapingIngester):
         # Format varies, but often includes:
         # Asset | Transaction Type | Date | Amount
         
-        lines = text.split('\n')
+        lines = text.splitlines()
         
         for i, line in enumerate(lines):
             # Look for transaction indicators
-            if any(word in line.lower() for word in ['purchase', 'sale', 'buy', 'sell', 'exchange']):
+            if _TXN_KEYWORD_RE.search(line):
                 # Try to extract trade info from this line and surrounding lines
-                trade_data = self._parse_trade_line(line, lines[max(0, i-2):min(len(lines), i+3)], filing)
+                trade_data = self._parse_trade_line(lines, i, filing)
                 
                 if trade_data:
                     trades.append(trade_data)
         
         return trades
     
-    def _parse_trade_line(self, line: str, context_lines: List[str], filing: Dict) -> Optional[RawTradeData]:
-        """Parse a single trade line with context."""
+    def _parse_trade_line(self, lines: List[str], i: int, filing: Dict) -> Optional[RawTradeData]:
+        """Parse the trade on lines[i], using the two lines either side as context."""
         
         try:
+            line = lines[i]
+            
             # Combine context for better parsing
-            full_text = ' '.join(context_lines)
+            full_text = ' '.join(lines[max(0, i - 2):i + 3])
             
             # Extract ticker (if present)
-            ticker_match = re.search(r'\b([A-Z]{1,5})\b', line)
-            ticker = ticker_match.group(1) if ticker_match else ''
+            ticker = _find_ticker(line)
             
             # Extract transaction type
+            line_lower = line.lower()
             trans_type = 'BUY'
-            if any(word in line.lower() for word in ['sale', 'sell']):
+            if 'sale' in line_lower or 'sell' in line_lower:
                 trans_type = 'SELL'
-            elif 'exchange' in line.lower():
+            elif 'exchange' in line_lower:
                 trans_type = 'EXCHANGE'
             
             # Extract date (various formats)
-            date_match = re.search(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', full_text)
-            if date_match:
-                date_str = date_match.group(1)
-                try:
-                    trade_date = datetime.strptime(date_str.replace('-', '/'), '%m/%d/%Y').date()
-                except:
-                    try:
-                        trade_date = datetime.strptime(date_str.replace('-', '/'), '%m/%d/%y').date()
-                    except:
-                        trade_date = date.today()
-            else:
-                trade_date = date.today()
+            date_match = _DATE_RE.search(full_text)
+            trade_date = (_parse_mdy(date_match.group(1)) if date_match else None) or date.today()
             
             # Extract amount (often ranges like "$15,001 - $50,000")
-            amount_match = re.search(r'\$[\d,]+\s*-\s*\$[\d,]+', full_text)
+            amount_match = _AMOUNT_RANGE_RE.search(full_text)
             if amount_match:
                 amount_str = amount_match.group(0)
                 amount = self._parse_amount_range(amount_str)
             else:
                 # Try single amount
-                amount_match = re.search(r'\$([\d,]+)', full_text)
+                amount_match = _AMOUNT_RE.search(full_text)
                 amount = float(amount_match.group(1).replace(',', '')) if amount_match else 0
             
             # Extract asset name (first capitalized phrase)
-            asset_match = re.search(r'([A-Z][a-zA-Z\s&\.]+(?:[A-Z][a-zA-Z\s&\.]+)*)', line)
+            asset_match = _ASSET_RE.search(line)
             asset_name = asset_match.group(1).strip() if asset_match else 'Unknown'
             
             return RawTradeData(
@@ -230,10 +336,10 @@ class HousePDFScraper(ScrapingIngester):
                 source_id=f"house_{filing['name']}_{ticker}_{trade_date}_{amount}",
                 reported_date=date.today(),  # PDF date not always clear
                 trade_date=trade_date,
-                ticker=ticker if ticker else asset_name[:10].upper(),
-                company_name=asset_name,
-                filer_name=filing['name'],
-                filer_type=FilerType.POLITICIAN.value,
+                ticker=self._intern(ticker if ticker else asset_name[:10].upper()),
+                company_name=self._intern(asset_name),
+                filer_name=self._intern(filing['name']),
+                filer_type=_POLITICIAN,
                 transaction_type=trans_type,
                 amount_usd=amount,
                 raw_data={
@@ -264,48 +370,47 @@ class HousePDFScraper(ScrapingIngester):
         date_col = next((i for i, h in enumerate(header) if 'date' in h), 2)
         amount_col = next((i for i, h in enumerate(header) if 'amount' in h or 'value' in h), 3)
         
+        today = date.today()
+        
         # Parse rows
         for row in table[1:]:
             if not row or len(row) < 2:
                 continue
             
             try:
-                asset = str(row[asset_col]) if asset_col < len(row) else ''
-                trans_type = str(row[type_col]) if type_col < len(row) else ''
-                date_str = str(row[date_col]) if date_col < len(row) else ''
-                amount_str = str(row[amount_col]) if amount_col < len(row) else ''
+                # pdfplumber cells are already str (or None for empty cells)
+                n = len(row)
+                asset = (row[asset_col] or '') if asset_col < n else ''
+                trans_type = (row[type_col] or '') if type_col < n else ''
+                date_str = (row[date_col] or '') if date_col < n else ''
+                amount_str = (row[amount_col] or '') if amount_col < n else ''
                 
                 # Skip if no meaningful data
-                if not asset or asset.lower() in ['none', 'n/a', '']:
+                if not asset or asset.lower() in _EMPTY_CELLS:
                     continue
                 
                 # Parse transaction type
-                trans_type_clean = 'BUY'
-                if 'sale' in trans_type.lower() or 'sell' in trans_type.lower():
-                    trans_type_clean = 'SELL'
+                trans_type_clean = 'SELL' if _SELL_RE.search(trans_type) else 'BUY'
                 
                 # Parse date
-                try:
-                    trade_date = datetime.strptime(date_str, '%m/%d/%Y').date()
-                except:
-                    trade_date = date.today()
+                trade_date = _parse_mdy(date_str) or today
                 
                 # Parse amount
                 amount = self._parse_amount_range(amount_str)
                 
                 # Extract ticker
-                ticker_match = re.search(r'\(([A-Z]{1,5})\)', asset)
+                ticker_match = _TABLE_TICKER_RE.search(asset)
                 ticker = ticker_match.group(1) if ticker_match else asset[:5].upper()
                 
                 trade_data = RawTradeData(
                     source="house_pdf",
                     source_id=f"house_table_{filing['name']}_{ticker}_{trade_date}",
-                    reported_date=date.today(),
+                    reported_date=today,
                     trade_date=trade_date,
-                    ticker=ticker,
-                    company_name=asset,
-                    filer_name=filing['name'],
-                    filer_type=FilerType.POLITICIAN.value,
+                    ticker=self._intern(ticker),
+                    company_name=self._intern(asset),
+                    filer_name=self._intern(filing['name']),
+                    filer_type=_POLITICIAN,
                     transaction_type=trans_type_clean,
                     amount_usd=amount,
                     raw_data={
@@ -328,23 +433,15 @@ class HousePDFScraper(ScrapingIngester):
         if not amount_str:
             return 0
         
-        # Remove $ and commas
-        amount_str = amount_str.replace('$', '').replace(',', '')
+        # Remove $ and commas in one pass, then split on the range separator.
+        # float() tolerates the surrounding whitespace.
+        low, sep, high = amount_str.translate(_AMOUNT_STRIP).partition('-')
         
-        # Check for range
-        if '-' in amount_str:
-            parts = amount_str.split('-')
-            try:
-                low = float(parts[0].strip())
-                high = float(parts[1].strip())
-                return (low + high) / 2
-            except:
-                return 0
-        
-        # Single value
         try:
-            return float(amount_str.strip())
-        except:
+            if sep:
+                return (float(low) + float(high)) / 2
+            return float(low)
+        except ValueError:
             return 0
     
     def fetch_historical_trades(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
@@ -363,25 +460,32 @@ class HousePDFScraper(ScrapingIngester):
         start_time = datetime.now()
         self.logger.info(f"Starting {self.name} ingestion")
         
-        if not PDFPLUMBER_AVAILABLE:
+        if not PDF_PARSER_AVAILABLE:
             return {
-                "error": "pdfplumber not installed. Run: pip install pdfplumber"
+                "error": "No PDF parser installed. Run: pip install pymupdf (or pdfplumber)"
             }
         
+        self._interned.clear()
+        
         try:
             trades_collected = 0
             trades_processed = 0
             errors = 0
             
-            for trade_data in self.fetch_recent_trades(days):
-                trades_processed += 1
+            # One session/commit per filing rather than per trade
+            for filing_trades in self._fetch_recent_filings(days):
+                if not filing_trades:
+                    continue
+                
+                trades_processed += len(filing_trades)
                 
                 try:
-                    self._save_trade(trade_data)
-                    trades_collected += 1
+                    batch_errors = self._save_trades_batch(filing_trades)
+                    trades_collected += len(filing_trades) - batch_errors
+                    errors += batch_errors
                 except Exception as e:
-                    self.logger.warning(f"Failed to save trade: {e}")
-                    errors += 1
+                    self.logger.warning(f"Failed to save filing trades: {e}")
+                    errors += len(filing_trades)
             
             end_time = datetime.now()
             runtime = (end_time - start_time).total_seconds()
@@ -402,57 +506,80 @@ class HousePDFScraper(ScrapingIngester):
             self.logger.error(f"Ingestion failed: {e}")
             raise IngestionError(f"House PDF ingestion failed: {e}")
     
-    def _save_trade(self, trade_data: RawTradeData):
-        """Save trade to database."""
+    def _save_trades_batch(self, trades: List[RawTradeData]) -> int:
+        """Save one filing's trades in a single session and commit.
+        
+        Returns:
+            Number of trades that could not be converted and were skipped
+        """
+        
+        errors = 0
         
         with get_session() as session:
-            # Get or create filer
-            filer = session.query(Filer).filter(Filer.name == trade_data.filer_name).first()
+            # Pre-load every referenced filer in one query
+            names = {t.filer_name for t in trades}
+            filers = {
+                f.name: f for f in
+                session.query(Filer).filter(Filer.name.in_(names)).all()
+            }
             
-            if not filer:
+            for name in names - filers.keys():
                 filer = Filer(
-                    name=trade_data.filer_name,
+                    name=name,
                     filer_type=FilerType.POLITICIAN,
                     chamber='House'
                 )
                 session.add(filer)
-                session.flush()
+                filers[name] = filer
+            session.flush()
             
-            # Check if exists
-            existing = session.query(Trade).filter(
-                Trade.source == DataSource.SCRAPED,
-                Trade.source_id == trade_data.source_id
-            ).first()
+            # Check which trades already exist in one IN query; seeding the
+            # seen-set with them also drops duplicates within the batch
+            seen = {
+                row.source_id for row in session.query(Trade.source_id).filter(
+                    Trade.source == DataSource.SCRAPED,
+                    Trade.source_id.in_({t.source_id for t in trades})
+                )
+            }
             
-            if existing:
-                return
+            new_rows = []
             
-            # Create trade
-            trade = Trade(
-                filer_id=filer.filer_id,
-                source=DataSource.SCRAPED,
-                source_id=trade_data.source_id,
-                reported_date=trade_data.reported_date,
-                trade_date=trade_data.trade_date,
-                ticker=trade_data.ticker,
-                company_name=trade_data.company_name,
-                transaction_type=TransactionType[trade_data.transaction_type],
-                amount_usd=Decimal(str(trade_data.amount_usd)) if trade_data.amount_usd else None,
-                filing_url=trade_data.raw_data.get('pdf_url'),
-                raw_data=trade_data.raw_data
-            )
+            for trade_data in trades:
+                if trade_data.source_id in seen:
+                    continue
+                seen.add(trade_data.source_id)
+                
+                try:
+                    new_rows.append({
+                        'filer_id': filers[trade_data.filer_name].filer_id,
+                        'source': DataSource.SCRAPED,
+                        'source_id': trade_data.source_id,
+                        'reported_date': trade_data.reported_date,
+                        'trade_date': trade_data.trade_date,
+                        'ticker': trade_data.ticker,
+                        'company_name': trade_data.company_name,
+                        'transaction_type': TransactionType[trade_data.transaction_type],
+                        'amount_usd': Decimal(str(trade_data.amount_usd)) if trade_data.amount_usd else None,
+                        'filing_url': trade_data.raw_data.get('pdf_url'),
+                        'raw_data': trade_data.raw_data
+                    })
+                except Exception as e:
+                    self.logger.warning(f"Failed to build trade {trade_data.source_id}: {e}")
+                    errors += 1
             
-            session.add(trade)
+            session.bulk_insert_mappings(Trade, new_rows)
             session.commit()
+        
+        return errors
 
 
 def main():
     """Test House PDF scraper."""
     logging.basicConfig(level=logging.INFO)
     
-    if not PDFPLUMBER_AVAILABLE:
-        print("❌ pdfplumber not installed")
-        print("Install with: pip install pdfplumber")
+    if not PDF_PARSER_AVAILABLE:
+        print("❌ No PDF parser installed")
+        print("Install with: pip install pymupdf (or pdfplumber)")
         return
     
     print("Testing House PDF scraper...")
@@ -1,12 +1,46 @@
 """Additional institutional data APIs: WhaleWisdom, Quandl, Options Flow."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from config.config import config
+from .base import response_json
+
+
+# Upper bound on in-flight requests for the *_bulk helpers
+MAX_CONCURRENT_REQUESTS = 8
+
+
+def _make_session() -> requests.Session:
+    """Create a keep-alive session pooled for MAX_CONCURRENT_REQUESTS."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_CONCURRENT_REQUESTS,
+        pool_maxsize=MAX_CONCURRENT_REQUESTS
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch_concurrently(fetch: Callable, keys: Iterable) -> Dict:
+    """Call fetch(key) for each key concurrently and return {key: result}.
+    
+    The API methods catch their own errors and return empty results, so one
+    failing key never aborts the batch. Wall time is roughly the slowest
+    request rather than the sum of all of them.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(keys))) as executor:
+        return dict(zip(keys, executor.map(fetch, keys)))
 
 
 class WhaleWisdomAPI:
@@ -15,8 +49,11 @@ class WhaleWisdomAPI:
     def __init__(self):
         # WhaleWisdom requires paid subscription
         # Add support for when user gets API key
-        self.api_key = config.api.__dict__.get('WHALE_WISDOM_API_KEY')
+        self.api_key = getattr(config.api, 'WHALE_WISDOM_API_KEY', None)
         self.base_url = "https://whalewisdom.com/api"
+        self.session = _make_session()
+        if self.api_key:
+            self.session.headers.update({'Authorization': f'Bearer {self.api_key}'})
         self.logger = logging.getLogger("whalewisdom")
         
     def get_institution_holdings(self, institution_id: str) -> Dict:
@@ -26,11 +63,10 @@ class WhaleWisdomAPI:
             return {}
         
         url = f"{self.base_url}/institution/{institution_id}/holdings"
-        headers = {'Authorization': f'Bearer {self.api_key}'}
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            return response.json()
+            response = self.session.get(url, timeout=10)
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch holdings: {e}")
             return {}
@@ -41,27 +77,29 @@ class WhaleWisdomAPI:
             return {}
         
         url = f"{self.base_url}/stock/{ticker}/holders"
-        headers = {'Authorization': f'Bearer {self.api_key}'}
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            return response.json()
+            response = self.session.get(url, timeout=10)
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch holders: {e}")
             return {}
     
+    def get_stock_holders_bulk(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Get institutional holders for several stocks concurrently."""
+        return _fetch_concurrently(self.get_stock_holders, tickers)
+    
     def search_institutions(self, query: str) -> List[Dict]:
         """Search for institutions."""
         if not self.api_key:
             return []
         
         url = f"{self.base_url}/search/institutions"
-        headers = {'Authorization': f'Bearer {self.api_key}'}
         params = {'q': query}
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             return data.get('results', [])
         except Exception as e:
             self.logger.error(f"Failed to search institutions: {e}")
@@ -72,8 +110,9 @@ class QuandlAPI:
     """Quandl API for financial and economic data."""
     
     def __init__(self):
-        self.api_key = config.api.__dict__.get('QUANDL_API_KEY')
+        self.api_key = getattr(config.api, 'QUANDL_API_KEY', None)
         self.base_url = "https://data.nasdaq.com/api/v3"
+        self.session = _make_session()
         self.logger = logging.getLogger("quandl")
         
     def get_dataset(self, database: str, dataset: str, **params) -> Dict:
@@ -91,8 +130,8 @@ class QuandlAPI:
         params['api_key'] = self.api_key
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            return response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch dataset: {e}")
             return {}
@@ -103,6 +142,10 @@ class QuandlAPI:
         # Example: SF1 database has institutional holdings
         return self.get_dataset('SF1', f'{ticker}_INSTOWN_MRQ')
     
+    def get_institutional_ownership_bulk(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Get institutional ownership for several stocks concurrently."""
+        return _fetch_concurrently(self.get_institutional_ownership, tickers)
+    
     def search_datasets(self, query: str) -> List[Dict]:
         """Search for datasets."""
         if not self.api_key:
@@ -112,8 +155,8 @@ class QuandlAPI:
         params = {'query': query, 'api_key': self.api_key}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             return data.get('datasets', [])
         except Exception as e:
             self.logger.error(f"Failed to search datasets: {e}")
@@ -125,12 +168,15 @@ class OptionsFlowAPI:
     
     def __init__(self):
         # Support for Unusual Whales or similar
-        self.uw_api_key = config.api.__dict__.get('UNUSUAL_WHALES_API_KEY')
+        self.uw_api_key = getattr(config.api, 'UNUSUAL_WHALES_API_KEY', None)
         self.uw_base_url = "https://api.unusualwhales.com"
+        self.uw_headers = {'Authorization': f'Bearer {self.uw_api_key}'}
         
-        self.flowalgo_key = config.api.__dict__.get('FLOWALGO_API_KEY')
+        self.flowalgo_key = getattr(config.api, 'FLOWALGO_API_KEY', None)
         self.flowalgo_url = "https://api.flowalgo.com"
+        self.flowalgo_headers = {'X-API-KEY': self.flowalgo_key}
         
+        self.session = _make_session()
         self.logger = logging.getLogger("options_flow")
         
     def get_unusual_options(self, ticker: str = None, limit: int = 100) -> List[Dict]:
@@ -147,19 +193,22 @@ class OptionsFlowAPI:
         self.logger.warning("No options flow API key configured")
         return []
     
+    def get_unusual_options_bulk(self, tickers: Iterable[str], limit: int = 100) -> Dict[str, List[Dict]]:
+        """Get unusual options activity for several tickers concurrently."""
+        return _fetch_concurrently(lambda t: self.get_unusual_options(t, limit), tickers)
+    
     def _get_uw_unusual_options(self, ticker: str = None, limit: int = 100) -> List[Dict]:
         """Get options from Unusual Whales."""
         
         url = f"{self.uw_base_url}/api/options/flow"
-        headers = {'Authorization': f'Bearer {self.uw_api_key}'}
         params = {'limit': limit}
         
         if ticker:
             params['ticker'] = ticker
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, headers=self.uw_headers, params=params, timeout=10)
+            data = response_json(response)
             return data.get('data', [])
         except Exception as e:
             self.logger.error(f"Failed to fetch UW options: {e}")
@@ -169,15 +218,14 @@ class OptionsFlowAPI:
         """Get options from FlowAlgo."""
         
         url = f"{self.flowalgo_url}/v1/flow"
-        headers = {'X-API-KEY': self.flowalgo_key}
         params = {'limit': limit}
         
         if ticker:
             params['ticker'] = ticker
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            return response.json()
+            response = self.session.get(url, headers=self.flowalgo_headers, params=params, timeout=10)
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch FlowAlgo options: {e}")
             return []
@@ -189,15 +237,14 @@ class OptionsFlowAPI:
             return []
         
         url = f"{self.uw_base_url}/api/darkpool"
-        headers = {'Authorization': f'Bearer {self.uw_api_key}'}
         params = {}
         
         if ticker:
             params['ticker'] = ticker
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, headers=self.uw_headers, params=params, timeout=10)
+            data = response_json(response)
             return data.get('data', [])
         except Exception as e:
             self.logger.error(f"Failed to fetch dark pool data: {e}")
@@ -210,11 +257,10 @@ class OptionsFlowAPI:
             return []
         
         url = f"{self.uw_base_url}/api/congress"
-        headers = {'Authorization': f'Bearer {self.uw_api_key}'}
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            data = response.json()
+            response = self.session.get(url, headers=self.uw_headers, timeout=10)
+            data = response_json(response)
             return data.get('data', [])
         except Exception as e:
             self.logger.error(f"Failed to fetch congress trades: {e}")
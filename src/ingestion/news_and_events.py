@@ -1,13 +1,89 @@
 """News aggregator and event calendar for market intelligence."""
 
+import bisect
+import heapq
+import io
 import logging
-from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
+import pandas as pd
 import requests
+from dateutil.tz import tzlocal
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
 from config.config import config
+from .base import response_json, response_json_lazy
+from .response_cache import ResponseCache, cached
+
+
+# In-flight request cap per news vendor, shared across tickers
+MAX_CONCURRENT_PER_SOURCE = 4
+
+# Tickers fetched at once by NewsAggregator.get_ticker_news_bulk
+MAX_CONCURRENT_TICKERS = 8
+
+# Federal Reserve publishes calendar on their website
+# This is a simplified version, sorted by date
+_FED_MEETINGS = (
+    {'date': '2024-01-31', 'type': 'FOMC Meeting'},
+    {'date': '2024-03-20', 'type': 'FOMC Meeting'},
+    {'date': '2024-05-01', 'type': 'FOMC Meeting'},
+    {'date': '2024-06-12', 'type': 'FOMC Meeting'},
+    {'date': '2024-07-31', 'type': 'FOMC Meeting'},
+    {'date': '2024-09-18', 'type': 'FOMC Meeting'},
+    {'date': '2024-11-07', 'type': 'FOMC Meeting'},
+    {'date': '2024-12-18', 'type': 'FOMC Meeting'},
+    {'date': '2025-01-29', 'type': 'FOMC Meeting'},
+    {'date': '2025-03-19', 'type': 'FOMC Meeting'},
+    {'date': '2025-04-30', 'type': 'FOMC Meeting'},
+    {'date': '2025-06-18', 'type': 'FOMC Meeting'},
+    {'date': '2025-07-30', 'type': 'FOMC Meeting'},
+    {'date': '2025-09-17', 'type': 'FOMC Meeting'},
+    {'date': '2025-11-05', 'type': 'FOMC Meeting'},
+    {'date': '2025-12-10', 'type': 'FOMC Meeting'},
+)
+_FED_MEETING_DATES = tuple(m['date'] for m in _FED_MEETINGS)
+
+
+def _published_date(item: Dict) -> str:
+    """Sort key for news items."""
+    return item.get('published_date') or ''
+
+
+def _finnhub_times(items: List) -> List[str]:
+    """Format Finnhub epoch-second 'datetime' fields as local ISO timestamps.
+    
+    Same output as datetime.fromtimestamp(ts).isoformat() per item, but
+    converted in one vectorized pass over the whole feed.
+    """
+    seconds = np.fromiter((item.get('datetime') or 0 for item in items), dtype='int64', count=len(items))
+    times = pd.to_datetime(seconds, unit='s', utc=True).tz_convert(tzlocal())
+    return times.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+
+
+def _make_session(pool_maxsize: int) -> requests.Session:
+    """Create a keep-alive session with retries, pooled for pool_maxsize connections per host."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        backoff_factor=0.3,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy
+    )
+    session.mount("https://", adapter)
+    return session
 
 
 class NewsAggregator:
@@ -21,27 +97,72 @@ class NewsAggregator:
         self.finnhub_key = config.api.FINNHUB_API_KEY
         self.alpha_vantage_key = config.api.ALPHA_VANTAGE_API_KEY
         
+        # One keep-alive session for all vendors, so bulk lookups reuse
+        # connections instead of opening one per request
+        self.session = _make_session(MAX_CONCURRENT_PER_SOURCE)
+        
+        # Per-vendor concurrency limits to stay inside provider rate limits
+        self._source_limits = {
+            source: threading.BoundedSemaphore(MAX_CONCURRENT_PER_SOURCE)
+            for source in ('polygon', 'finnhub', 'alphavantage')
+        }
+        
+        self.cache = ResponseCache("news")
+    
+    def _get(self, source: str, url: str, params: Dict) -> requests.Response:
+        """GET from a news vendor, respecting that vendor's concurrency limit."""
+        with self._source_limits[source]:
+            return self.session.get(url, params=params, timeout=10)
+    
+    def get_ticker_news_bulk(self, tickers: Iterable[str], limit: int = 10) -> Dict[str, List[Dict]]:
+        """Get news for several tickers concurrently.
+        
+        Returns:
+            Mapping of ticker to its news items (same shape as get_ticker_news)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_TICKERS, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(lambda t: self.get_ticker_news(t, limit), tickers)))
+    
+    @cached(ttl=60, key=lambda ticker, limit=10: f"ticker:{ticker}:{limit}")
     def get_ticker_news(self, ticker: str, limit: int = 10) -> List[Dict]:
         """Get news for a specific ticker from all available sources."""
         
-        all_news = []
+        fetchers = []
         
         # Polygon.io news
         if self.polygon_key:
-            all_news.extend(self._get_polygon_news(ticker, limit))
+            fetchers.append(lambda: self._get_polygon_news(ticker, limit))
         
         # Finnhub news
         if self.finnhub_key:
-            all_news.extend(self._get_finnhub_news(ticker))
+            fetchers.append(lambda: self._get_finnhub_news(ticker))
         
         # Alpha Vantage news
         if self.alpha_vantage_key:
-            all_news.extend(self._get_alpha_vantage_news(ticker))
+            fetchers.append(lambda: self._get_alpha_vantage_news(ticker))
+        
+        if not fetchers:
+            return []
         
-        # Sort by date
-        all_news.sort(key=lambda x: x.get('published_date', ''), reverse=True)
+        # Sources are independent, so query them concurrently; each fetcher
+        # handles its own errors and returns [] on failure
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            results = list(executor.map(lambda fetch: fetch(), fetchers))
         
-        return all_news[:limit]
+        # Vendors return feeds newest-first, so each per-source sort is a single
+        # linear pass; merge the sorted streams and stop after limit items
+        for items in results:
+            items.sort(key=_published_date, reverse=True)
+        
+        return list(islice(heapq.merge(*results, key=_published_date, reverse=True), limit))
+    
+    # Same as get_ticker_news, but returns the cached JSON bytes without
+    # rebuilding any dicts on a hit
+    get_ticker_news_json = get_ticker_news.raw
     
     def _get_polygon_news(self, ticker: str, limit: int) -> List[Dict]:
         """Get news from Polygon.io."""
@@ -54,8 +175,9 @@ class NewsAggregator:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self._get('polygon', url, params)
+            # Only a handful of keys per item are read
+            data = response_json_lazy(response)
             
             news_items = []
             for item in data.get('results', []):
@@ -66,13 +188,13 @@ class NewsAggregator:
                     'url': item.get('article_url'),
                     'published_date': item.get('published_utc'),
                     'publisher': item.get('publisher', {}).get('name'),
-                    'tickers': item.get('tickers', [])
+                    'tickers': list(item.get('tickers', []))
                 })
             
             return news_items
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch Polygon news: {e}")
+            self.logger.error("Failed to fetch Polygon news: %s", e)
             return []
     
     def _get_finnhub_news(self, ticker: str) -> List[Dict]:
@@ -90,17 +212,20 @@ class NewsAggregator:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self._get('finnhub', url, params)
+            # Only a handful of keys per item are read
+            data = response_json_lazy(response)
+            
+            items = list(data)
             
             news_items = []
-            for item in data:
+            for item, published in zip(items, _finnhub_times(items)):
                 news_items.append({
                     'source': 'finnhub',
                     'title': item.get('headline'),
                     'description': item.get('summary'),
                     'url': item.get('url'),
-                    'published_date': datetime.fromtimestamp(item.get('datetime', 0)).isoformat(),
+                    'published_date': published,
                     'publisher': item.get('source'),
                     'category': item.get('category')
                 })
@@ -108,7 +233,7 @@ class NewsAggregator:
             return news_items
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch Finnhub news: {e}")
+            self.logger.error("Failed to fetch Finnhub news: %s", e)
             return []
     
     def _get_alpha_vantage_news(self, ticker: str) -> List[Dict]:
@@ -122,8 +247,9 @@ class NewsAggregator:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self._get('alphavantage', url, params)
+            # Only a handful of keys per item are read
+            data = response_json_lazy(response)
             
             news_items = []
             for item in data.get('feed', []):
@@ -141,9 +267,10 @@ class NewsAggregator:
             return news_items
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch Alpha Vantage news: {e}")
+            self.logger.error("Failed to fetch Alpha Vantage news: %s", e)
             return []
     
+    @cached(ttl=60, key=lambda limit=20: f"market:{limit}")
     def get_market_news(self, limit: int = 20) -> List[Dict]:
         """Get general market news."""
         
@@ -155,22 +282,27 @@ class NewsAggregator:
             params = {'category': 'general', 'token': self.finnhub_key}
             
             try:
-                response = requests.get(url, params=params, timeout=10)
-                data = response.json()
+                response = self._get('finnhub', url, params)
+                data = response_json(response)
+                
+                items = data[:limit]
                 
-                for item in data[:limit]:
+                for item, published in zip(items, _finnhub_times(items)):
                     all_news.append({
                         'source': 'finnhub',
                         'title': item.get('headline'),
                         'description': item.get('summary'),
                         'url': item.get('url'),
-                        'published_date': datetime.fromtimestamp(item.get('datetime', 0)).isoformat(),
+                        'published_date': published,
                         'category': item.get('category')
                     })
             except Exception as e:
-                self.logger.error(f"Failed to fetch market news: {e}")
+                self.logger.error("Failed to fetch market news: %s", e)
         
         return all_news
+    
+    # Same as get_market_news, but returns the cached JSON bytes
+    get_market_news_json = get_market_news.raw
 
 
 class EventCalendar:
@@ -181,6 +313,12 @@ class EventCalendar:
         self.finnhub_key = config.api.FINNHUB_API_KEY
         self.alpha_vantage_key = config.api.ALPHA_VANTAGE_API_KEY
         
+        # Calendar calls hit the same two hosts, so reuse connections across them
+        self.session = _make_session(4)
+        
+        self.cache = ResponseCache("events")
+        
+    @cached(ttl=3600, key=lambda from_date=None, to_date=None: f"earnings:{from_date or date.today()}:{to_date}")
     def get_earnings_calendar(self, from_date: date = None, to_date: date = None) -> List[Dict]:
         """Get earnings calendar."""
         
@@ -212,8 +350,8 @@ class EventCalendar:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             
             events = []
             for item in data.get('earningsCalendar', []):
@@ -231,7 +369,7 @@ class EventCalendar:
             return events
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch Finnhub earnings: {e}")
+            self.logger.error("Failed to fetch Finnhub earnings: %s", e)
             return []
     
     def _get_alpha_vantage_earnings(self) -> List[Dict]:
@@ -245,29 +383,27 @@ class EventCalendar:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            # Alpha Vantage returns CSV
-            lines = response.text.strip().split('\n')
+            response = self.session.get(url, params=params, timeout=10)
+            # Alpha Vantage returns CSV (symbol,name,reportDate,fiscalDateEnding,estimate,currency);
+            # pandas' C parser also copes with quoted commas in company names
+            df = pd.read_csv(io.StringIO(response.text), dtype=str, nrows=50)  # Limit to 50
+            df = df.astype(object).where(df.notna(), None)
             
-            events = []
-            if len(lines) > 1:
-                headers = lines[0].split(',')
-                for line in lines[1:]:
-                    values = line.split(',')
-                    if len(values) >= 3:
-                        events.append({
-                            'type': 'earnings',
-                            'ticker': values[0],
-                            'date': values[1],
-                            'eps_estimate': values[2] if len(values) > 2 else None
-                        })
-            
-            return events[:50]  # Limit to 50
+            return [
+                {
+                    'type': 'earnings',
+                    'ticker': row['symbol'],
+                    'date': row['reportDate'],
+                    'eps_estimate': row['estimate']
+                }
+                for row in df.to_dict('records')
+            ]
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch Alpha Vantage earnings: {e}")
+            self.logger.error("Failed to fetch Alpha Vantage earnings: %s", e)
             return []
     
+    @cached(ttl=1800, key=lambda: "economic")
     def get_economic_calendar(self) -> List[Dict]:
         """Get economic events (FOMC, GDP, etc.)."""
         
@@ -278,8 +414,8 @@ class EventCalendar:
         params = {'token': self.finnhub_key}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             
             events = []
             for item in data.get('economicCalendar', []):
@@ -297,9 +433,10 @@ class EventCalendar:
             return events
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch economic calendar: {e}")
+            self.logger.error("Failed to fetch economic calendar: %s", e)
             return []
     
+    @cached(ttl=6 * 3600, key=lambda: f"ipo:{date.today()}")
     def get_ipo_calendar(self) -> List[Dict]:
         """Get IPO calendar."""
         
@@ -318,8 +455,8 @@ class EventCalendar:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             
             events = []
             for item in data.get('ipoCalendar', []):
@@ -338,44 +475,16 @@ class EventCalendar:
             return events
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch IPO calendar: {e}")
+            self.logger.error("Failed to fetch IPO calendar: %s", e)
             return []
     
     def get_fed_calendar(self) -> List[Dict]:
         """Get Federal Reserve meeting calendar."""
         
-        # Federal Reserve publishes calendar on their website
-        # This is a simplified version
-        
-        fed_meetings_2024 = [
-            {'date': '2024-01-31', 'type': 'FOMC Meeting'},
-            {'date': '2024-03-20', 'type': 'FOMC Meeting'},
-            {'date': '2024-05-01', 'type': 'FOMC Meeting'},
-            {'date': '2024-06-12', 'type': 'FOMC Meeting'},
-            {'date': '2024-07-31', 'type': 'FOMC Meeting'},
-            {'date': '2024-09-18', 'type': 'FOMC Meeting'},
-            {'date': '2024-11-07', 'type': 'FOMC Meeting'},
-            {'date': '2024-12-18', 'type': 'FOMC Meeting'},
-        ]
-        
-        fed_meetings_2025 = [
-            {'date': '2025-01-29', 'type': 'FOMC Meeting'},
-            {'date': '2025-03-19', 'type': 'FOMC Meeting'},
-            {'date': '2025-04-30', 'type': 'FOMC Meeting'},
-            {'date': '2025-06-18', 'type': 'FOMC Meeting'},
-            {'date': '2025-07-30', 'type': 'FOMC Meeting'},
-            {'date': '2025-09-17', 'type': 'FOMC Meeting'},
-            {'date': '2025-11-05', 'type': 'FOMC Meeting'},
-            {'date': '2025-12-10', 'type': 'FOMC Meeting'},
-        ]
-        
-        all_meetings = fed_meetings_2024 + fed_meetings_2025
-        
         # Filter to upcoming meetings
-        today = date.today().isoformat()
-        upcoming = [m for m in all_meetings if m['date'] >= today]
+        i = bisect.bisect_left(_FED_MEETING_DATES, date.today().isoformat())
         
-        return upcoming[:3]  # Next 3 meetings
+        return [dict(m) for m in _FED_MEETINGS[i:i + 3]]  # Next 3 meetings
 
 
 # Test function
@@ -2,12 +2,13 @@
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Iterator
-from decimal import Decimal
+from typing import BinaryIO, Dict, Iterator
 
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import pandas as pd
 
 from config.config import config
@@ -15,6 +16,67 @@ from src.database import get_session, Filer, Trade, FilerType, TransactionType,
 from .base import ScrapingIngester, RawTradeData, IngestionError
 
 
+# Pages downloaded at once by fetch_recent_trades
+MAX_PAGE_WORKERS = 4
+
+# Listing pages change constantly, so cached copies are always revalidated
+# with a conditional GET; an unchanged page costs only a 304
+PAGE_CACHE_TTL = 0
+
+# Compiled once: every OpenInsider data table carries the "tinytable" class
+_TABLE_XPATH = etree.XPath("//table[contains(concat(' ', normalize-space(@class), ' '), ' tinytable ')]")
+_ROW_XPATH = etree.XPath(".//tr")
+_CELL_XPATH = etree.XPath("./td")
+_LINK_XPATH = etree.XPath(".//a")
+
+# Amount cells: thousands separators, currency and explicit plus signs are noise
+_AMOUNT_STRIP_RE = re.compile(r'[,$+]')
+_AMOUNT_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# OpenInsider trade type codes -> TransactionType names
+_TRANSACTION_CODES = {
+    'P': "BUY",
+    'S': "SELL",
+    'A': "AWARD",
+    'G': "GIFT",
+    'M': "OPTION_EXERCISE",
+}
+
+# tinytable column order based on actual structure:
+# 0: X, 1: Filing Date, 2: Trade Date, 3: Ticker, 4: Company Name,
+# 5: Industry, 6: Ins (insider count), 7: Trade Type, 8: Price,
+# 9: Qty, 10: Owned, 11: ΔOwn, 12: Value, 13-16: performance
+_CELL_INDICES = (1, 2, 3, 4, 5, 7, 8, 9, 12)
+_COLUMNS = [
+    'filing_date', 'trade_date', 'ticker', 'company_name', 'industry',
+    'trade_type', 'price', 'quantity', 'value', 'insider_name'
+]
+
+# Columns of the cleaned trades frame (see OpenInsiderScraper._clean_rows)
+_FRAME_COLUMNS = _COLUMNS + ['reported_date', 'transaction_type', 'source_id', 'filing_url']
+
+
+def _to_dates(values: pd.Series) -> pd.Series:
+    """'YYYY-MM-DD[ HH:MM:SS]' strings to dates (NaT if unparseable)."""
+    days = values.str.split(n=1).str[0]
+    return pd.to_datetime(days, format="%Y-%m-%d", errors="coerce").dt.date
+
+
+def _nonzero(values: pd.Series) -> pd.Series:
+    """Replace zeros with None (an amount of 0 means unknown on OpenInsider)."""
+    return values.where(values != 0, None)
+
+
+def _to_amounts(values: pd.Series) -> pd.Series:
+    """OpenInsider amount strings ("+$1,234", "-56", "1.2M") to floats (NaN if unparseable)."""
+    cleaned = values.str.replace(_AMOUNT_STRIP_RE, "", regex=True).str.replace("−", "-").str.strip()
+    suffix = cleaned.str[-1:]
+    has_suffix = suffix.isin(list(_AMOUNT_MULTIPLIERS))
+    cleaned = cleaned.mask(has_suffix, cleaned.str[:-1])
+    multiplier = suffix.map(_AMOUNT_MULTIPLIERS).fillna(1)
+    return pd.to_numeric(cleaned, errors="coerce") * multiplier
+
+
 class OpenInsiderScraper(ScrapingIngester):
     """Scraper for OpenInsider.com - cleaned insider transaction data."""
     
@@ -25,6 +87,9 @@ class OpenInsiderScraper(ScrapingIngester):
         )
         self.rate_limit = config.api.OPENINSIDER_RATE_LIMIT
         
+        # Last seen body + ETag/Last-Modified per page, for conditional GETs
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
     def fetch_historical_trades(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
         """Fetch historical trades (OpenInsider doesn't support specific date ranges)."""
         # OpenInsider doesn't have date range filtering, so just fetch recent
@@ -39,9 +104,16 @@ class OpenInsiderScraper(ScrapingIngester):
     
     def fetch_recent_trades(self, days: int = 30) -> Iterator[RawTradeData]:
         """Fetch recent insider trades from OpenInsider."""
+        return self._frame_to_trades(self.fetch_recent_frame(days))
+    
+    def fetch_recent_frame(self, days: int = 30) -> pd.DataFrame:
+        """Fetch recent insider trades as one DataFrame (one column per field).
         
-        all_trades = []
-        seen_ids = set()
+        Cheaper than materializing a RawTradeData per row when the trades are
+        only going to be bulk-inserted; see _FRAME_COLUMNS for the layout.
+        """
+        
+        frames = []
         
         # OpenInsider pages to scrape (each has tinytable with data)
         pages = [
@@ -51,201 +123,168 @@ class OpenInsiderScraper(ScrapingIngester):
             "top-insider-purchases-by-value"
         ]
         
-        for page in pages:
-            try:
-                url = f"{self.base_url}/{page}" if page else self.base_url
-                response = self._make_request(url)
-                trades = self._parse_page(response.text)
-                
-                # Deduplicate
-                for trade in trades:
-                    trade_id = f"{trade.ticker}_{trade.filer_name}_{trade.trade_date}_{trade.amount_usd}"
-                    if trade_id not in seen_ids:
-                        seen_ids.add(trade_id)
-                        all_trades.append(trade)
-                
-                self.logger.info(f"Fetched {len(trades)} trades from {page or 'homepage'}")
+        # Pages are independent, so download them concurrently; request starts
+        # are still spaced by the ingester's rate limit. Each worker parses its
+        # page as soon as it arrives, overlapping with downloads still in flight.
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            futures = {executor.submit(self._fetch_page, page): page for page in pages}
+            
+            for future in as_completed(futures):
+                page = futures[future]
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    self.logger.warning("Failed to fetch from %s: %s", page, e)
+                    continue
                 
-            except Exception as e:
-                self.logger.warning(f"Failed to fetch from {page}: {e}")
-                continue
+                frames.append(frame)
+                self.logger.info("Fetched %s trades from %s", len(frame), page or 'homepage')
+        
+        if not frames:
+            return pd.DataFrame(columns=_FRAME_COLUMNS)
+        
+        # Deduplicate (the pages overlap heavily)
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=['ticker', 'insider_name', 'trade_date', 'value'])
         
         # Filter by date
         cutoff_date = date.today() - timedelta(days=days)
-        for trade in all_trades:
-            if trade.trade_date and trade.trade_date >= cutoff_date:
-                yield trade
+        return df[df['trade_date'] >= cutoff_date]
+    
+    def _frame_to_trades(self, df: pd.DataFrame) -> Iterator[RawTradeData]:
+        """Materialize RawTradeData records from a trades frame."""
+        for row in df.itertuples(index=False):
+            yield RawTradeData(
+                source="openinsider",
+                source_id=row.source_id,
+                reported_date=row.reported_date,
+                trade_date=row.trade_date,
+                ticker=row.ticker,
+                company_name=row.company_name,
+                filer_name=row.insider_name,
+                filer_type=FilerType.CORPORATE_INSIDER.value,
+                transaction_type=row.transaction_type,
+                quantity=row.quantity,
+                price=row.price,
+                amount_usd=row.value,
+                insider_relationship=row.industry,
+                raw_data={
+                    "source": "openinsider",
+                    "industry": row.industry,
+                    "filing_url": row.filing_url
+                }
+            )
     
-    def _parse_page(self, html: str) -> List[RawTradeData]:
-        """Parse OpenInsider page with tinytable."""
+    def _fetch_page(self, page: str) -> pd.DataFrame:
+        """Download (or revalidate) one OpenInsider page and parse it."""
+        url = f"{self.base_url}/{page}" if page else self.base_url
+        with self._open_cached(url, PAGE_CACHE_TTL) as f:
+            return self._parse_page(f)
+    
+    def _parse_page(self, f: BinaryIO) -> pd.DataFrame:
+        """Parse OpenInsider page with tinytable into a trades frame."""
         
-        trades = []
-        soup = BeautifulSoup(html, 'html.parser')
+        doc = lxml.html.parse(f).getroot()
         
         # Find all tinytable tables (homepage has multiple)
-        tables = soup.find_all('table', {'class': 'tinytable'})
+        tables = _TABLE_XPATH(doc)
         if not tables:
             self.logger.warning("No tinytable found in OpenInsider response")
-            return trades
+            return pd.DataFrame(columns=_FRAME_COLUMNS)
         
+        # Only pull raw cell text per row; cleaning is done column-wise below
+        rows = []
         for table in tables:
             # Parse table rows (skip header row)
-            rows = table.find_all('tr')[1:]
-            
-            for row in rows:
-                try:
-                    cols = row.find_all('td')
-                    if len(cols) < 13:
-                        continue
-                    
-                    # Column order based on actual structure:
-                    # 0: X, 1: Filing Date, 2: Trade Date, 3: Ticker, 4: Company Name,
-                    # 5: Industry, 6: Ins (insider count), 7: Trade Type, 8: Price,
-                    # 9: Qty, 10: Owned, 11: ΔOwn, 12: Value, 13-16: performance
-                    
-                    filing_date_str = cols[1].text.strip()
-                    trade_date_str = cols[2].text.strip()
-                    ticker = cols[3].text.strip()
-                    company_name = cols[4].text.strip()
-                    industry = cols[5].text.strip() if len(cols) > 5 else ""
-                    trade_type_str = cols[7].text.strip() if len(cols) > 7 else "P"
-                    price_str = cols[8].text.strip() if len(cols) > 8 else ""
-                    qty_str = cols[9].text.strip() if len(cols) > 9 else ""
-                    value_str = cols[12].text.strip() if len(cols) > 12 else ""
-                    
-                    # Parse dates (format: YYYY-MM-DD HH:MM:SS or YYYY-MM-DD)
-                    filing_date = self._parse_date(filing_date_str.split()[0] if ' ' in filing_date_str else filing_date_str)
-                    trade_date = self._parse_date(trade_date_str.split()[0] if ' ' in trade_date_str else trade_date_str)
-                    
-                    if not trade_date or not ticker:
-                        continue
-                    
-                    # Parse transaction type (returns string like 'BUY', 'SELL', etc.)
-                    transaction_type = self._parse_transaction_type(trade_type_str)
-                    
-                    # Parse amounts
-                    price = self._parse_amount(price_str)
-                    quantity = self._parse_amount(qty_str)
-                    value = self._parse_amount(value_str)
-                    
-                    # Calculate value if not provided
-                    if not value and price and quantity:
-                        value = price * quantity
-                    
-                    # Get insider name from linked page (or use company for now)
-                    insider_link = cols[3].find('a')
-                    insider_name = insider_link.get('title', company_name) if insider_link else company_name
-                    
-                    # Create trade data
-                    trade_data = RawTradeData(
-                        source="openinsider",
-                        source_id=f"oi_{ticker}_{trade_date}_{value}",
-                        reported_date=filing_date or trade_date,
-                        trade_date=trade_date,
-                        ticker=ticker.upper(),
-                        company_name=company_name,
-                        filer_name=insider_name,
-                        filer_type=FilerType.CORPORATE_INSIDER.value,
-                        transaction_type=transaction_type,
-                        quantity=quantity,
-                        price=price,
-                        amount_usd=value,
-                        insider_relationship=industry,
-                        raw_data={
-                            "source": "openinsider",
-                            "industry": industry,
-                            "filing_url": f"{self.base_url}/{ticker}"
-                        }
-                    )
-                    
-                    trades.append(trade_data)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse row: {e}")
+            for row in _ROW_XPATH(table)[1:]:
+                cells = _CELL_XPATH(row)
+                if len(cells) < 13:
                     continue
+                
+                # Insider name lives in the ticker link's title attribute
+                insider_link = _LINK_XPATH(cells[3])
+                rows.append(
+                    [cells[i].text_content().strip() for i in _CELL_INDICES]
+                    + [insider_link[0].get('title') if insider_link else None]
+                )
         
-        return trades
-    
-    def _parse_date(self, date_str: str) -> Optional[date]:
-        """Parse date from OpenInsider format (YYYY-MM-DD)."""
-        if not date_str or date_str == "-":
-            return None
-        
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d").date()
-        except:
-            return None
-    
-    def _parse_transaction_type(self, type_str: str) -> str:
-        """Parse transaction type from OpenInsider code."""
-        type_str = type_str.upper().strip()
+        if not rows:
+            return pd.DataFrame(columns=_FRAME_COLUMNS)
         
-        if type_str in ["P", "P - Purchase"]:
-            return "BUY"
-        elif type_str in ["S", "S - Sale"]:
-            return "SELL"
-        elif type_str in ["A", "A - Award"]:
-            return "AWARD"
-        elif type_str in ["G", "G - Gift"]:
-            return "GIFT"
-        elif type_str in ["M", "M - Option Exercise"]:
-            return "OPTION_EXERCISE"
-        else:
-            return "OTHER"
+        return self._clean_rows(pd.DataFrame(rows, columns=_COLUMNS))
     
-    def _parse_amount(self, amount_str: str) -> Optional[float]:
-        """Parse amount from OpenInsider format (with commas, +/- signs)."""
-        if not amount_str or amount_str == "-":
-            return None
+    def _clean_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Clean raw tinytable cell text with column-wise operations.
         
-        try:
-            # Remove commas, $, and +/- signs
-            cleaned = amount_str.replace(",", "").replace("$", "").replace("+", "").replace("−", "-")
-            cleaned = cleaned.strip()
+        Args:
+            df: One row per table row, raw strings in _COLUMNS order
             
-            # Handle K/M/B suffixes
-            multiplier = 1
-            if cleaned.endswith("K"):
-                multiplier = 1_000
-                cleaned = cleaned[:-1]
-            elif cleaned.endswith("M"):
-                multiplier = 1_000_000
-                cleaned = cleaned[:-1]
-            elif cleaned.endswith("B"):
-                multiplier = 1_000_000_000
-                cleaned = cleaned[:-1]
-            
-            return float(cleaned) * multiplier
-        except:
-            return None
+        Returns:
+            Rows with a trade date and ticker; dates, amounts and transaction
+            types parsed, and missing values as None
+        """
+        df['filing_date'] = _to_dates(df['filing_date'])
+        df['trade_date'] = _to_dates(df['trade_date'])
+        df = df[df['trade_date'].notna() & (df['ticker'] != "")].copy()
+        
+        # Codes are a single letter, optionally followed by a description
+        # ("P - Purchase", "S - Sale+OE"), so the first letter decides
+        codes = df['trade_type'].str.strip().str[:1].str.upper()
+        df['transaction_type'] = codes.map(_TRANSACTION_CODES).fillna("OTHER")
+        
+        price = _to_amounts(df['price'])
+        quantity = _to_amounts(df['quantity'])
+        value = _to_amounts(df['value'])
+        
+        # Calculate value if not provided
+        computed = price * quantity
+        missing = value.isna() | (value == 0)
+        value = value.mask(missing & computed.notna() & (computed != 0), computed)
+        
+        df['price'] = price
+        df['quantity'] = quantity
+        df['value'] = value
+        df['insider_name'] = df['insider_name'].fillna(df['company_name'])
+        df['reported_date'] = df['filing_date'].fillna(df['trade_date'])
+        
+        # Back to plain Python objects with None for missing, as RawTradeData expects
+        df = df.astype(object).where(df.notna(), None)
+        
+        # Ids and links use the ticker as printed on the page
+        df['source_id'] = "oi_" + df['ticker'] + "_" + df['trade_date'].map(str) + "_" + df['value'].map(str)
+        df['filing_url'] = f"{self.base_url}/" + df['ticker']
+        df['ticker'] = df['ticker'].str.upper()
+        
+        return df
     
     def run_ingestion(self, mode: str = "recent", days: int = 30, **kwargs) -> Dict:
         """Run OpenInsider ingestion."""
         
         start_time = datetime.now()
-        self.logger.info(f"Starting {self.name} ingestion in {mode} mode")
+        self.logger.info("Starting %s ingestion in %s mode", self.name, mode)
         
         try:
             trades_collected = 0
             trades_processed = 0
             errors = 0
             
-            # Fetch trades
-            for trade_data in self.fetch_recent_trades(days):
-                trades_processed += 1
-                
-                # Save to database
+            # Fetch everything first, then save in one session/commit straight
+            # from the columnar frame
+            df = self.fetch_recent_frame(days)
+            trades_processed = len(df)
+            
+            if trades_processed:
                 try:
-                    self._save_trade(trade_data)
-                    trades_collected += 1
+                    errors = self._save_trades_batch(df)
+                    trades_collected = trades_processed - errors
                 except Exception as e:
-                    self.logger.warning(f"Failed to save trade: {e}")
-                    errors += 1
+                    self.logger.warning("Failed to save trades: %s", e)
+                    errors = trades_processed
             
             end_time = datetime.now()
             runtime = (end_time - start_time).total_seconds()
             
-            self.logger.info(f"Ingestion completed: {trades_collected}/{trades_processed} trades collected in {runtime:.1f} seconds")
+            self.logger.info("Ingestion completed: %s/%s trades collected in %.1f seconds", trades_collected, trades_processed, runtime)
             
             return {
                 "mode": mode,
@@ -258,54 +297,80 @@ class OpenInsiderScraper(ScrapingIngester):
             }
             
         except Exception as e:
-            self.logger.error(f"Ingestion failed: {e}")
+            self.logger.error("Ingestion failed: %s", e)
             raise IngestionError(f"OpenInsider ingestion failed: {e}")
     
-    def _save_trade(self, trade_data: RawTradeData):
-        """Save trade to database."""
+    def _save_trades_batch(self, df: pd.DataFrame) -> int:
+        """Save a trades frame in a single session and commit.
+        
+        Returns:
+            Number of trades that could not be converted and were skipped
+        """
         
         with get_session() as session:
-            # Get or create filer
-            filer = session.query(Filer).filter(Filer.name == trade_data.filer_name).first()
+            # Pre-load every referenced filer in one query; a new filer takes
+            # company/title from its first trade
+            first_trades = df.drop_duplicates(subset='insider_name')
+            filers = {
+                f.name: f for f in
+                session.query(Filer).filter(Filer.name.in_(first_trades['insider_name'].tolist())).all()
+            }
             
-            if not filer:
+            missing = first_trades[~first_trades['insider_name'].isin(list(filers))]
+            for row in missing.itertuples(index=False):
                 filer = Filer(
-                    name=trade_data.filer_name,
+                    name=row.insider_name,
                     filer_type=FilerType.CORPORATE_INSIDER,
-                    company=trade_data.company_name,
-                    title=trade_data.insider_relationship
+                    company=row.company_name,
+                    title=row.industry
                 )
                 session.add(filer)
-                session.flush()
+                filers[row.insider_name] = filer
+            session.flush()
             
-            # Check if trade exists
-            existing = session.query(Trade).filter(
-                Trade.source == DataSource.OPENINSIDER,
-                Trade.source_id == trade_data.source_id
-            ).first()
+            # Check which trades already exist in one IN query, and drop
+            # duplicates within the batch
+            existing = {
+                row.source_id for row in session.query(Trade.source_id).filter(
+                    Trade.source == DataSource.OPENINSIDER,
+                    Trade.source_id.in_(df['source_id'].unique().tolist())
+                )
+            }
+            new = df[~df['source_id'].isin(list(existing))].drop_duplicates(subset='source_id')
             
-            if existing:
-                return
+            # Use bracket notation for enum by name; unknown names can't be saved
+            transaction_types = new['transaction_type'].map(dict(TransactionType.__members__))
+            valid = transaction_types.notna()
+            errors = int((~valid).sum())
+            new = new[valid]
             
-            # Create trade
-            trade = Trade(
-                filer_id=filer.filer_id,
-                source=DataSource.OPENINSIDER,
-                source_id=trade_data.source_id,
-                reported_date=trade_data.reported_date,
-                trade_date=trade_data.trade_date,
-                ticker=trade_data.ticker,
-                company_name=trade_data.company_name,
-                transaction_type=TransactionType[trade_data.transaction_type],  # Use bracket notation for enum by name
-                quantity=Decimal(str(trade_data.quantity)) if trade_data.quantity else None,
-                price=Decimal(str(trade_data.price)) if trade_data.price else None,
-                amount_usd=Decimal(str(trade_data.amount_usd)) if trade_data.amount_usd else None,
-                insider_relationship=trade_data.insider_relationship,
-                raw_data=trade_data.raw_data
-            )
+            # Build the insert mappings column-wise. Numeric columns take floats
+            # as-is: SQLite stores them as REAL anyway, and PostgreSQL drivers
+            # send the shortest repr, which is exactly what Decimal(str(x))
+            # would have produced.
+            rows = pd.DataFrame({
+                'filer_id': new['insider_name'].map({name: f.filer_id for name, f in filers.items()}),
+                'source': DataSource.OPENINSIDER,
+                'source_id': new['source_id'],
+                'reported_date': new['reported_date'],
+                'trade_date': new['trade_date'],
+                'ticker': new['ticker'],
+                'company_name': new['company_name'],
+                'transaction_type': transaction_types[valid],
+                'quantity': _nonzero(new['quantity']),
+                'price': _nonzero(new['price']),
+                'amount_usd': _nonzero(new['value']),
+                'insider_relationship': new['industry'],
+                'raw_data': pd.Series([
+                    {"source": "openinsider", "industry": industry, "filing_url": url}
+                    for industry, url in zip(new['industry'], new['filing_url'])
+                ], index=new.index, dtype=object)
+            })
             
-            session.add(trade)
+            session.bulk_insert_mappings(Trade, rows.to_dict('records'))
             session.commit()
+        
+        return errors
 
 
 # Helper function for testing
@@ -1,17 +1,159 @@
 """Scraper for politician trading disclosures."""
 
+import hashlib
 import re
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Iterator, Union, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Iterator, Union, Any, Sequence, Tuple
 from urllib.parse import urljoin
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
 
 from config.config import config
 from src.database import get_session, Filer, Trade, FilerType, TransactionType, DataSource
-from .base import APIIngester, ScrapingIngester, RawTradeData, IngestionError
+from .base import APIIngester, ScrapingIngester, RawTradeData, IngestionError, response_json
+
+
+_CELL_XPATH = etree.XPath("./td")
+
+# Amount/date cleanup, compiled once rather than looked up in re's cache per trade
+_CURRENCY_RE = re.compile(r'[$,]')
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+_DIGITS_RE = re.compile(r'(\d+)')
+
+# Date formats tried by each scraper, in order
+_QUIVER_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S")
+_CAPITOL_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%b %d, %Y")
+
+
+@lru_cache(maxsize=4096)
+def _strptime_date(date_str: str, fmt: str) -> Optional[date]:
+    """strptime(...).date(), or None; report dates repeat a lot, so cache them."""
+    try:
+        return datetime.strptime(date_str, fmt).date()
+    except ValueError:
+        return None
+
+
+def _parse_date_formats(date_str: str, formats: Sequence[str],
+                        preferred: Optional[str]) -> Tuple[Optional[date], Optional[str]]:
+    """Parse date_str with the first matching format, trying preferred first.
+    
+    A feed sticks to one format, so callers pass back the format that
+    matched last time and usually skip the scan entirely.
+    
+    Returns:
+        Tuple of (parsed date or None, format that matched or None)
+    """
+    if preferred:
+        parsed = _strptime_date(date_str, preferred)
+        if parsed:
+            return parsed, preferred
+    
+    for fmt in formats:
+        if fmt == preferred:
+            continue
+        parsed = _strptime_date(date_str, fmt)
+        if parsed:
+            return parsed, fmt
+    
+    return None, None
+
+
+# Quiver's transaction vocabulary, resolved without any substring scans
+_TRANSACTION_TYPES = {
+    "Purchase": "buy",
+    "Sale": "sell",
+    "Sale (Full)": "sell",
+    "Sale (Partial)": "sell",
+    "Exchange": "exchange",
+}
+
+
+@lru_cache(maxsize=64)
+def _classify_transaction(transaction_str: str) -> str:
+    """Substring-based fallback for transaction strings not in _TRANSACTION_TYPES."""
+    transaction_lower = transaction_str.lower()
+    
+    if "buy" in transaction_lower or "purchase" in transaction_lower:
+        return "buy"
+    elif "sell" in transaction_lower or "sale" in transaction_lower:
+        return "sell"
+    elif "option" in transaction_lower:
+        if "buy" in transaction_lower:
+            return "option_buy"
+        elif "sell" in transaction_lower:
+            return "option_sell"
+        else:
+            return "option"
+    else:
+        return transaction_lower
+
+
+def _iter_trade_rows(source) -> Iterator:
+    """Stream Capitol Trades rows out of a page, freeing each once consumed.
+    
+    Trade rows carry the "q-tr" class among others. Only the row being
+    processed is kept in memory, however large the page.
+    
+    Args:
+        source: File-like object with the page's HTML bytes
+    """
+    for _, row in etree.iterparse(source, events=('end',), tag='tr', html=True, recover=True):
+        if 'q-tr' in (row.get('class') or '').split():
+            yield row
+        
+        # Rows are independent; drop this one and any earlier siblings
+        row.clear(keep_tail=True)
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+
+
+def _cell_text(cell) -> str:
+    """Text of a table cell, like bs4's get_text(strip=True)."""
+    return "".join(text.strip() for text in cell.itertext())
+
+
+def _iter_trade_cells(response: requests.Response) -> Iterator[List[str]]:
+    """Yield the stripped cell texts of each Capitol Trades row.
+    
+    Uses selectolax's lexbor parser when installed, which is several times
+    faster than lxml on whole pages. Otherwise the body is fed straight from
+    the socket into _iter_trade_rows, so the page is never held in memory;
+    request it with stream=True in that case.
+    
+    Args:
+        response: Response for a trades page
+    """
+    if SELECTOLAX_AVAILABLE:
+        for row in HTMLParser(response.content).css("tr.q-tr"):
+            yield [td.text(strip=True) for td in row.css("td")]
+        return
+    
+    response.raw.decode_content = True
+    for row in _iter_trade_rows(response.raw):
+        yield [_cell_text(cell) for cell in _CELL_XPATH(row)]
 
 
 class QuiverPoliticianScraper(APIIngester):
@@ -25,6 +167,9 @@ class QuiverPoliticianScraper(APIIngester):
             rate_limit=config.api.QUIVER_RATE_LIMIT
         )
         
+        # Format that parsed the last date, tried first next time
+        self._preferred_date_fmt: Optional[str] = None
+        
         if not self.api_key:
             self.logger.warning("No Quiver API key found - will skip Quiver ingestion")
     
@@ -39,7 +184,7 @@ class QuiverPoliticianScraper(APIIngester):
         
         try:
             response = self._make_request(url)
-            trades_data = response.json()
+            trades_data = response_json(response)
             
             for trade in trades_data:
                 yield self._parse_quiver_trade(trade)
@@ -59,17 +204,23 @@ class QuiverPoliticianScraper(APIIngester):
         url = self._build_url(endpoint)
         
         try:
-            response = self._make_request(url)
-            trades_data = response.json()
-            
-            for trade in trades_data:
-                trade_date = self._parse_date(trade.get("transaction_date"))
-                report_date = self._parse_date(trade.get("report_date"))
+            # The full history is large; with ijson the array is parsed as it
+            # downloads, so trades are filtered and yielded with O(1) memory
+            with self._make_request(url, stream=IJSON_AVAILABLE) as response:
+                if IJSON_AVAILABLE:
+                    response.raw.decode_content = True
+                    trades_data = ijson.items(response.raw, 'item', use_float=True)
+                else:
+                    trades_data = response_json(response)
                 
-                # Filter by date range
-                relevant_date = trade_date or report_date
-                if relevant_date and start_date <= relevant_date <= end_date:
-                    yield self._parse_quiver_trade(trade)
+                for trade in trades_data:
+                    trade_date = self._parse_date(trade.get("transaction_date"))
+                    report_date = self._parse_date(trade.get("report_date"))
+                    
+                    # Filter by date range
+                    relevant_date = trade_date or report_date
+                    if relevant_date and start_date <= relevant_date <= end_date:
+                        yield self._parse_quiver_trade(trade)
                     
         except Exception as e:
             self.logger.error(f"Failed to fetch historical trades from Quiver: {e}")
@@ -85,7 +236,7 @@ class QuiverPoliticianScraper(APIIngester):
         
         try:
             response = self._make_request(url)
-            trades_data = response.json()
+            trades_data = response_json(response)
             
             for trade in trades_data:
                 yield self._parse_quiver_trade(trade)
@@ -116,13 +267,22 @@ class QuiverPoliticianScraper(APIIngester):
         if not date_str:
             return None
         
+        date_str = date_str.split("T")[0]
+        
+        # Quiver dates are almost always ISO, which ciso8601 parses in C
+        if CISO8601_AVAILABLE:
+            try:
+                return ciso8601.parse_datetime(date_str).date()
+            except ValueError:
+                pass
+        
         try:
             # Try different date formats
-            for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S"]:
-                try:
-                    return datetime.strptime(date_str.split("T")[0], fmt).date()
-                except ValueError:
-                    continue
+            parsed, fmt = _parse_date_formats(date_str, _QUIVER_DATE_FORMATS,
+                                              self._preferred_date_fmt)
+            if parsed:
+                self._preferred_date_fmt = fmt
+                return parsed
             
             self.logger.warning(f"Could not parse date: {date_str}")
             return None
@@ -141,17 +301,17 @@ class QuiverPoliticianScraper(APIIngester):
                 return float(amount_str)
             
             # Remove currency symbols and commas
-            amount_clean = re.sub(r'[$,]', '', str(amount_str))
+            amount_clean = _CURRENCY_RE.sub('', str(amount_str))
             
             # Handle ranges (e.g., "$15,001 - $50,000")
             if " - " in amount_clean:
                 parts = amount_clean.split(" - ")
-                low = float(re.sub(r'[^\d.]', '', parts[0]))
-                high = float(re.sub(r'[^\d.]', '', parts[1]))
+                low = float(_NON_NUMERIC_RE.sub('', parts[0]))
+                high = float(_NON_NUMERIC_RE.sub('', parts[1]))
                 return (low + high) / 2  # Take midpoint
             
             # Single value
-            return float(re.sub(r'[^\d.]', '', amount_clean))
+            return float(_NON_NUMERIC_RE.sub('', amount_clean))
             
         except Exception as e:
             self.logger.warning(f"Amount parsing error for '{amount_str}': {e}")
@@ -162,21 +322,7 @@ class QuiverPoliticianScraper(APIIngester):
         if not transaction_str:
             return ""
         
-        transaction_lower = transaction_str.lower()
-        
-        if "buy" in transaction_lower or "purchase" in transaction_lower:
-            return "buy"
-        elif "sell" in transaction_lower or "sale" in transaction_lower:
-            return "sell"
-        elif "option" in transaction_lower:
-            if "buy" in transaction_lower:
-                return "option_buy"
-            elif "sell" in transaction_lower:
-                return "option_sell"
-            else:
-                return "option"
-        else:
-            return transaction_str.lower()
+        return _TRANSACTION_TYPES.get(transaction_str) or _classify_transaction(transaction_str)
 
 
 class CapitolTradesScraper(ScrapingIngester):
@@ -187,26 +333,30 @@ class CapitolTradesScraper(ScrapingIngester):
             name="capitol_trades",
             base_url="https://www.capitoltrades.com"
         )
+        
+        # Format that parsed the last date, tried first next time
+        self._preferred_date_fmt: Optional[str] = None
     
     def fetch_recent_trades(self, days: int = 30) -> Iterator[RawTradeData]:
         """Scrape recent trades from Capitol Trades."""
         url = urljoin(self.base_url, "/trades")
         
+        # Read the clock once per run rather than once per row
+        today = date.today()
+        cutoff_date = today - timedelta(days=days)
+        
         try:
-            response = self._make_request(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Parse trade table
-            trade_rows = soup.find_all('tr', {'class': 'q-tr'})
-            
-            for row in trade_rows:
-                try:
-                    trade_data = self._parse_capitol_trades_row(row)
-                    if trade_data and self._is_recent_trade(trade_data.reported_date, days):
-                        yield trade_data
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse row: {e}")
-                    continue
+            # selectolax needs the whole page; the lxml fallback streams it
+            with self._make_request(url, stream=not SELECTOLAX_AVAILABLE) as response:
+                # Parse trade table
+                for cells in _iter_trade_cells(response):
+                    try:
+                        trade_data = self._parse_capitol_trades_row(cells, today)
+                        if trade_data and self._is_recent_trade(trade_data.reported_date, cutoff_date):
+                            yield trade_data
+                    except Exception as e:
+                        self.logger.warning(f"Failed to parse row: {e}")
+                        continue
                     
         except Exception as e:
             self.logger.error(f"Failed to scrape Capitol Trades: {e}")
@@ -227,73 +377,83 @@ class CapitolTradesScraper(ScrapingIngester):
             if trade.filer_name and filer_identifier.lower() in trade.filer_name.lower():
                 yield trade
     
-    def _parse_capitol_trades_row(self, row) -> Optional[RawTradeData]:
-        """Parse a table row from Capitol Trades."""
+    def _parse_capitol_trades_row(self, cells: List[str], today: Optional[date] = None) -> Optional[RawTradeData]:
+        """Parse a table row from Capitol Trades.
+        
+        Args:
+            cells: Stripped text of the row's cells
+            today: Reference date for relative dates like '2 days ago'
+        """
         try:
-            cells = row.find_all('td')
             if len(cells) < 6:
                 return None
             
             # Extract data from cells
-            politician = cells[0].get_text(strip=True)
-            trade_date = cells[1].get_text(strip=True)
-            ticker = cells[2].get_text(strip=True)
-            transaction = cells[3].get_text(strip=True)
-            amount = cells[4].get_text(strip=True)
+            politician = cells[0]
+            trade_date = cells[1]
+            ticker = cells[2]
+            transaction = cells[3]
+            amount = cells[4]
             
             return RawTradeData(
                 source="capitol_trades",
-                source_id=f"ct_{hash(politician + trade_date + ticker)}",
+                # Stable across processes, unlike the salted builtin hash()
+                source_id=f"ct_{hashlib.blake2b(f'{politician}|{trade_date}|{ticker}'.encode(), digest_size=8).hexdigest()}",
                 filer_name=politician,
                 filer_type="politician",
-                reported_date=self._parse_date_from_text(trade_date),
+                reported_date=self._parse_date_from_text(trade_date, today),
                 ticker=ticker.upper() if ticker else None,
                 transaction_type=self._normalize_transaction_type(transaction),
                 amount_usd=self._parse_amount(amount),
                 filing_url=self.base_url + "/trades",
-                raw_data={"cells": [cell.get_text(strip=True) for cell in cells]}
+                raw_data={"cells": cells}
             )
             
         except Exception as e:
             self.logger.warning(f"Row parsing error: {e}")
             return None
     
-    def _parse_date_from_text(self, date_text: str) -> Optional[date]:
-        """Parse date from text like '2 days ago' or actual date."""
+    def _parse_date_from_text(self, date_text: str, today: Optional[date] = None) -> Optional[date]:
+        """Parse date from text like '2 days ago' or actual date.
+        
+        Args:
+            date_text: Date text from the trades table
+            today: Reference date for relative dates, defaults to date.today()
+        """
         if not date_text:
             return None
         
+        if today is None:
+            today = date.today()
+        
         try:
             # Handle relative dates like "2 days ago"
             if "ago" in date_text.lower():
                 if "day" in date_text:
-                    days = int(re.search(r'(\d+)', date_text).group(1))
-                    return date.today() - timedelta(days=days)
+                    days = int(_DIGITS_RE.search(date_text).group(1))
+                    return today - timedelta(days=days)
                 elif "week" in date_text:
-                    weeks = int(re.search(r'(\d+)', date_text).group(1))
-                    return date.today() - timedelta(weeks=weeks)
+                    weeks = int(_DIGITS_RE.search(date_text).group(1))
+                    return today - timedelta(weeks=weeks)
                 elif "month" in date_text:
-                    months = int(re.search(r'(\d+)', date_text).group(1))
-                    return date.today() - timedelta(days=months * 30)
+                    months = int(_DIGITS_RE.search(date_text).group(1))
+                    return today - timedelta(days=months * 30)
             
             # Try actual date formats
-            for fmt in ["%m/%d/%Y", "%Y-%m-%d", "%b %d, %Y"]:
-                try:
-                    return datetime.strptime(date_text, fmt).date()
-                except ValueError:
-                    continue
+            parsed, fmt = _parse_date_formats(date_text, _CAPITOL_DATE_FORMATS, self._preferred_date_fmt)
+            if parsed:
+                self._preferred_date_fmt = fmt
             
-            return None
+            return parsed
             
         except Exception:
             return None
     
-    def _is_recent_trade(self, trade_date: Optional[date], days: int) -> bool:
-        """Check if trade is within the recent days window."""
+    def _is_recent_trade(self, trade_date: Optional[date], cutoff_date: date) -> bool:
+        """Check if trade falls on or after the recent window's cutoff date."""
         if not trade_date:
             return False
         
-        cutoff_date = date.today() - timedelta(days=days)
         return trade_date >= cutoff_date
 
 
@@ -329,19 +489,30 @@ class PoliticianScraper:
         results = {}
         total_trades = 0
         
-        for scraper in self.scrapers:
-            try:
-                self.logger.info(f"Running ingestion for {scraper.name}")
-                result = scraper.run_ingestion(mode="recent", days=days)
-                results[scraper.name] = result
-                total_trades += result.get("trades_collected", 0)
-                
-                # Save trades to database
-                self._save_trades_to_db(scraper.fetch_recent_trades(days))
-                
-            except Exception as e:
-                self.logger.error(f"Ingestion failed for {scraper.name}: {e}")
-                results[scraper.name] = {"error": str(e)}
+        if not self.scrapers:
+            return {"total_trades": 0, "scraper_results": results}
+        
+        # Sources are independent and I/O-bound, so fetch them concurrently;
+        # database writes stay on this thread so no session crosses threads
+        with ThreadPoolExecutor(max_workers=len(self.scrapers)) as executor:
+            futures = {
+                executor.submit(self._fetch_from_scraper, scraper, days): scraper
+                for scraper in self.scrapers
+            }
+            
+            for future in as_completed(futures):
+                scraper = futures[future]
+                try:
+                    result, trades = future.result()
+                    results[scraper.name] = result
+                    total_trades += result.get("trades_collected", 0)
+                    
+                    # Save trades to database
+                    self._save_trades_to_db(trades)
+                    
+                except Exception as e:
+                    self.logger.error(f"Ingestion failed for {scraper.name}: {e}")
+                    results[scraper.name] = {"error": str(e)}
         
         self.logger.info(f"Political ingestion complete: {total_trades} total trades")
         return {
@@ -349,63 +520,79 @@ class PoliticianScraper:
             "scraper_results": results
         }
     
+    def _fetch_from_scraper(self, scraper, days: int) -> Tuple[Dict[str, Any], List[RawTradeData]]:
+        """Run one scraper's ingestion and collect its recent trades (no DB access)."""
+        self.logger.info(f"Running ingestion for {scraper.name}")
+        result = scraper.run_ingestion(mode="recent", days=days)
+        return result, list(scraper.fetch_recent_trades(days))
+    
     def _save_trades_to_db(self, trades_iter: Iterator[RawTradeData]):
-        """Save trades to database."""
+        """Save trades to database with one existence query and one bulk insert."""
+        # Drop repeats within the batch (e.g. a row seen on several pages)
+        # before any database work
+        trades = list({(t.source, t.source_id): t for t in trades_iter}.values())
+        if not trades:
+            return
+        
+        sources = {s.value: s for s in DataSource}
+        
         with get_session() as session:
-            for trade_data in trades_iter:
+            # Load every politician filer once (a few hundred at most) and
+            # create the missing ones with a single flush
+            filers = {
+                f.name: f for f in
+                session.query(Filer).filter(Filer.filer_type == FilerType.POLITICIAN)
+            }
+            
+            for name in {t.filer_name for t in trades} - filers.keys():
+                filer = Filer(
+                    name=name,
+                    filer_type=FilerType.POLITICIAN
+                )
+                session.add(filer)
+                filers[name] = filer
+            session.flush()
+            
+            # Check which trades already exist in one query on the
+            # (source, source_id) unique index
+            seen = set(
+                session.query(Trade.source, Trade.source_id).filter(
+                    Trade.source.in_({sources[t.source] for t in trades if t.source in sources}),
+                    Trade.source_id.in_({t.source_id for t in trades})
+                )
+            )
+            
+            transaction_types = {t.value for t in TransactionType}
+            new_rows = []
+            
+            for trade_data in trades:
                 try:
-                    # Get or create filer
-                    filer = self._get_or_create_filer(session, trade_data)
-                    
-                    # Check if trade already exists
-                    existing_trade = session.query(Trade).filter(
-                        Trade.source == DataSource(trade_data.source),
-                        Trade.source_id == trade_data.source_id
-                    ).first()
-                    
-                    if existing_trade:
+                    source = DataSource(trade_data.source)
+                    if (source, trade_data.source_id) in seen:
                         continue
                     
-                    # Create new trade
-                    trade = Trade(
-                        filer_id=filer.filer_id,
-                        source=DataSource(trade_data.source),
-                        source_id=trade_data.source_id,
-                        reported_date=trade_data.reported_date,
-                        trade_date=trade_data.trade_date,
-                        ticker=trade_data.ticker,
-                        company_name=trade_data.company_name,
-                        transaction_type=TransactionType(trade_data.transaction_type)
-                            if trade_data.transaction_type in [t.value for t in TransactionType]
+                    new_rows.append({
+                        'filer_id': filers[trade_data.filer_name].filer_id,
+                        'source': source,
+                        'source_id': trade_data.source_id,
+                        'reported_date': trade_data.reported_date,
+                        'trade_date': trade_data.trade_date,
+                        'ticker': trade_data.ticker,
+                        'company_name': trade_data.company_name,
+                        'transaction_type': TransactionType(trade_data.transaction_type)
+                            if trade_data.transaction_type in transaction_types
                             else TransactionType.BUY,
-                        amount_usd=trade_data.amount_usd,
-                        insider_relationship=trade_data.insider_relationship,
-                        filing_url=trade_data.filing_url,
-                        raw_data=trade_data.raw_data
-                    )
-                    
-                    session.add(trade)
+                        'amount_usd': trade_data.amount_usd,
+                        'insider_relationship': trade_data.insider_relationship,
+                        'filing_url': trade_data.filing_url,
+                        'raw_data': trade_data.raw_data
+                    })
                     
                 except Exception as e:
                     self.logger.warning(f"Failed to save trade: {e}")
                     continue
-    
-    def _get_or_create_filer(self, session, trade_data: RawTradeData) -> Filer:
-        """Get or create filer from trade data."""
-        filer = session.query(Filer).filter(
-            Filer.name == trade_data.filer_name,
-            Filer.filer_type == FilerType.POLITICIAN
-        ).first()
-        
-        if not filer:
-            filer = Filer(
-                name=trade_data.filer_name,
-                filer_type=FilerType.POLITICIAN
-            )
-            session.add(filer)
-            session.flush()
-        
-        return filer
+            
+            session.bulk_insert_mappings(Trade, new_rows)
 
 
 if __name__ == "__main__":
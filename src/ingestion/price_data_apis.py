@@ -1,23 +1,93 @@
 """Price data API integrations (Alpha Vantage, Tiingo, Polygon)."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 from decimal import Decimal
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config.config import config
+from .base import TokenBucket, response_json
+from .response_cache import ResponseCache, cached
 
 
-class AlphaVantageAPI:
+# Upper bound on in-flight requests for the *_bulk helpers
+MAX_CONCURRENT_REQUESTS = 8
+
+# Cache lifetimes (seconds). Daily bars only change once a day, but today's
+# bar is still forming during the session, so keep the window short.
+DAILY_PRICES_TTL = 3600
+NEWS_TTL = 600
+
+
+def _make_session() -> requests.Session:
+    """Create a keep-alive session with retries for one price API."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        backoff_factor=0.3,
+        raise_on_status=False
+    )
+    # Each API talks to a single host; one keep-alive connection per bulk
+    # worker, and pool_block makes extra callers wait for a warm connection
+    # instead of opening (and then discarding) a fresh TLS connection
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_CONCURRENT_REQUESTS,
+        pool_block=True,
+        max_retries=retry_strategy
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def _fetch_concurrently(fetch: Callable, keys: Iterable) -> Dict:
+    """Call fetch(key) for each key concurrently and return {key: result}.
+    
+    The API methods catch their own errors and return empty results, so one
+    failing ticker never aborts the batch.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(keys))) as executor:
+        return dict(zip(keys, executor.map(fetch, keys)))
+
+
+class _SessionMixin:
+    """Shared close()/context-manager support for the API classes below."""
+    
+    session: requests.Session
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AlphaVantageAPI(_SessionMixin):
     """Alpha Vantage API for stock prices and fundamentals."""
     
     def __init__(self):
         self.api_key = config.api.ALPHA_VANTAGE_API_KEY
         self.base_url = config.api.ALPHA_VANTAGE_BASE_URL
         self.logger = logging.getLogger("alphavantage")
+        self.session = _make_session()
+        self.rate_limiter = TokenBucket(config.api.ALPHA_VANTAGE_RATE_LIMIT / 60.0)
+        self.cache = ResponseCache("alphavantage")
         
+    @cached(ttl=DAILY_PRICES_TTL, key=lambda ticker, outputsize="compact": f"daily:{ticker}:{outputsize}")
     def get_daily_prices(self, ticker: str, outputsize: str = "compact") -> Dict:
         """Get daily prices for a ticker."""
         if not self.api_key:
@@ -32,14 +102,25 @@ class AlphaVantageAPI:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            return response.json()
+            self.rate_limiter.acquire()
+            response = self.session.get(self.base_url, params=params, timeout=10)
+            data = response_json(response)
+            
+            # Errors and throttling notes come back as HTTP 200; don't cache them
+            if 'Error Message' in data or 'Note' in data or 'Information' in data:
+                self.logger.warning(f"Alpha Vantage returned no prices for {ticker}: {data}")
+                return {}
+            return data
         except Exception as e:
             self.logger.error(f"Failed to fetch {ticker}: {e}")
             return {}
+    
+    def get_daily_prices_bulk(self, tickers: Iterable[str], outputsize: str = "compact") -> Dict[str, Dict]:
+        """Get daily prices for several tickers concurrently."""
+        return _fetch_concurrently(lambda t: self.get_daily_prices(t, outputsize), tickers)
 
 
-class TiingoAPI:
+class TiingoAPI(_SessionMixin):
     """Tiingo API for reliable EOD prices."""
     
     def __init__(self):
@@ -47,6 +128,13 @@ class TiingoAPI:
         self.base_url = config.api.TIINGO_BASE_URL
         self.logger = logging.getLogger("tiingo")
         
+        self.session = _make_session()
+        self.rate_limiter = TokenBucket(config.api.TIINGO_RATE_LIMIT / 3600.0)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f'Token {self.api_key}'
+        })
+        
     def get_daily_prices(self, ticker: str, start_date: str = None, end_date: str = None) -> List[Dict]:
         """Get daily prices for a ticker."""
         if not self.api_key:
@@ -54,10 +142,6 @@ class TiingoAPI:
             return []
         
         url = f"{self.base_url}/tiingo/daily/{ticker}/prices"
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Token {self.api_key}'
-        }
         
         params = {}
         if start_date:
@@ -66,21 +150,31 @@ class TiingoAPI:
             params['endDate'] = end_date
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            return response.json()
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch {ticker}: {e}")
             return []
+    
+    def get_daily_prices_bulk(self, tickers: Iterable[str], start_date: str = None,
+                              end_date: str = None) -> Dict[str, List[Dict]]:
+        """Get daily prices for several tickers concurrently."""
+        return _fetch_concurrently(lambda t: self.get_daily_prices(t, start_date, end_date), tickers)
 
 
-class PolygonAPI:
+class PolygonAPI(_SessionMixin):
     """Polygon.io API for market data and news."""
     
     def __init__(self):
         self.api_key = config.api.POLYGON_API_KEY
         self.base_url = config.api.POLYGON_BASE_URL
         self.logger = logging.getLogger("polygon")
+        self.session = _make_session()
+        self.rate_limiter = TokenBucket(config.api.POLYGON_RATE_LIMIT / 60.0)
+        self.cache = ResponseCache("polygon")
         
+    @cached(ttl=DAILY_PRICES_TTL, key=lambda ticker, from_date, to_date: f"aggs:{ticker}:{from_date}:{to_date}")
     def get_daily_prices(self, ticker: str, from_date: str, to_date: str) -> Dict:
         """Get daily prices (aggregates)."""
         if not self.api_key:
@@ -91,12 +185,47 @@ class PolygonAPI:
         params = {'apiKey': self.api_key}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            return response.json()
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            return response_json(response)
         except Exception as e:
             self.logger.error(f"Failed to fetch {ticker}: {e}")
             return {}
     
+    def get_daily_prices_bulk(self, tickers: Iterable[str], from_date: str, to_date: str) -> Dict[str, Dict]:
+        """Get daily prices for several tickers concurrently."""
+        return _fetch_concurrently(lambda t: self.get_daily_prices(t, from_date, to_date), tickers)
+    
+    def get_grouped_daily(self, date_str: str) -> Dict[str, Dict]:
+        """Get one day's OHLCV bar for every US stock in a single request.
+        
+        Prefer this over per-ticker get_daily_prices for daily refreshes of
+        many tickers; keep get_daily_prices for history backfills.
+        
+        Args:
+            date_str: Trading day as YYYY-MM-DD
+            
+        Returns:
+            Mapping of ticker to its aggregate bar (Polygon 'o', 'h', 'l', 'c', 'v', ...)
+        """
+        if not self.api_key:
+            self.logger.warning("No Polygon API key")
+            return {}
+        
+        url = f"{self.base_url}/v2/aggs/grouped/locale/us/market/stocks/{date_str}"
+        params = {'adjusted': 'true', 'apiKey': self.api_key}
+        
+        try:
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=30)
+            data = response_json(response)
+            return {bar['T']: bar for bar in data.get('results', [])}
+        except Exception as e:
+            self.logger.error(f"Failed to fetch grouped daily bars for {date_str}: {e}")
+            return {}
+    
+    @cached(ttl=NEWS_TTL, key=lambda ticker, limit=10: f"news:{ticker}:{limit}")
     def get_ticker_news(self, ticker: str, limit: int = 10) -> List[Dict]:
         """Get news for a ticker."""
         if not self.api_key:
@@ -110,8 +239,9 @@ class PolygonAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
+            data = response_json(response)
             return data.get('results', [])
         except Exception as e:
             self.logger.error(f"Failed to fetch news for {ticker}: {e}")
@@ -0,0 +1,166 @@
+"""TTL cache for API responses, backed by Redis with an in-process fallback."""
+
+import json
+import time
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from config.config import config
+
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=str).encode()
+
+
+def _loads(payload: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class ResponseCache:
+    """Key/value cache with per-entry TTL.
+    
+    Values are stored JSON-serialized, so every hit returns a fresh copy
+    that callers may mutate. Redis (config.database.REDIS_URL) is used when
+    the client is installed and the server answers; otherwise entries live
+    in a process-local dict.
+    """
+    
+    def __init__(self, namespace: str, redis_url: Optional[str] = None):
+        """Initialize the cache.
+        
+        Args:
+            namespace: Prefix for all keys written by this cache
+            redis_url: Redis URL. If None, uses config.database.REDIS_URL
+        """
+        self.namespace = namespace
+        self._redis = None
+        self._local: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+        
+        if REDIS_AVAILABLE:
+            try:
+                client = redis.Redis.from_url(
+                    redis_url or config.database.REDIS_URL,
+                    socket_timeout=0.5,
+                    socket_connect_timeout=0.5
+                )
+                client.ping()
+                self._redis = client
+            except redis.RedisError as e:
+                logger.debug(f"Redis unavailable for {namespace} cache, using in-process cache: {e}")
+    
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expiry."""
+        payload = self.get_raw(key)
+        return _loads(payload) if payload is not None else None
+    
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """Return the serialized JSON bytes for key, or None on a miss or expiry."""
+        full_key = self._key(key)
+        
+        if self._redis is not None:
+            try:
+                return self._redis.get(full_key)
+            except redis.RedisError as e:
+                logger.debug(f"Redis GET failed for {full_key}: {e}")
+                return None
+        
+        with self._lock:
+            entry = self._local.get(full_key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._local[full_key]
+                return None
+            return payload
+    
+    def set(self, key: str, value: Any, ttl: int) -> bytes:
+        """Store a JSON-serializable value for ttl seconds.
+        
+        Returns:
+            The serialized JSON bytes that were stored
+        """
+        full_key = self._key(key)
+        payload = _dumps(value)
+        
+        if self._redis is not None:
+            try:
+                self._redis.setex(full_key, ttl, payload)
+            except redis.RedisError as e:
+                logger.debug(f"Redis SETEX failed for {full_key}: {e}")
+            return payload
+        
+        with self._lock:
+            self._local[full_key] = (time.monotonic() + ttl, payload)
+        return payload
+
+
+def cached(ttl: int, key: Callable[..., str]):
+    """Cache a method's result in ``self.cache`` (a ResponseCache) for ttl seconds.
+    
+    Args:
+        ttl: Time to live in seconds
+        key: Builds the cache key from the method's arguments (excluding self)
+    
+    Empty results are not cached, since the API methods return empty
+    lists/dicts on failure and those should be retried.
+    
+    The wrapper also gets a ``raw`` attribute with the same signature that
+    returns the result as serialized JSON bytes, straight from the cache on
+    a hit, for callers that only pass the payload on (e.g. HTTP responses).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            
+            hit = self.cache.get(cache_key)
+            if hit is not None:
+                return hit
+            
+            result = method(self, *args, **kwargs)
+            if result:
+                self.cache.set(cache_key, result, ttl)
+            return result
+        
+        def raw(self, *args, **kwargs) -> bytes:
+            cache_key = key(*args, **kwargs)
+            
+            payload = self.cache.get_raw(cache_key)
+            if payload is not None:
+                return payload
+            
+            result = method(self, *args, **kwargs)
+            if result:
+                return self.cache.set(cache_key, result, ttl)
+            return _dumps(result)
+        
+        wrapper.raw = raw
+        return wrapper
+    
+    return decorator
@@ -1,18 +1,92 @@
 """SEC 13F filings scraper for institutional holdings (hedge funds, billionaires)."""
 
 import logging
+import math
+import queue
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Iterator
-from decimal import Decimal
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Iterator, Set, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config.config import config
 from src.database import get_session, Filer, Trade, FilerType, TransactionType, DataSource
-from .base import ScrapingIngester, RawTradeData, IngestionError
+from .base import ScrapingIngester, RawTradeData, IngestionError, TokenBucket
+
+
+# Namespace of the information table in current-format 13F filings
+INFO_TABLE_NS = '{http://www.sec.gov/edgar/document/thirteenf/informationtable}'
+
+# Compiled per-entry field lookups, keyed by the entry's namespace prefix
+# ('' for the bare older format): (name, title of class, shares, value).
+# The paths follow the infoTable schema exactly rather than searching the
+# entry's whole subtree. Text fields return a list of text nodes; the
+# numeric ones are converted by libxml2 and return NaN when absent.
+_INFO_TABLE_XPATHS = {
+    ns: (
+        etree.ETXPath(f'{ns}nameOfIssuer/text()'),
+        etree.ETXPath(f'{ns}titleOfClass/text()'),
+        etree.ETXPath(f'number({ns}shrsOrPrnAmt/{ns}sshPrnamt)'),
+        etree.ETXPath(f'number({ns}value)'),
+    )
+    for ns in (INFO_TABLE_NS, '')
+}
+
+# Ticker cleanup, compiled once rather than per holding
+_CLASS_SUFFIX_RE = re.compile(r'\s+(COM|CL [A-Z]|SHS).*')
+_NAME_TICKER_RE = re.compile(r'\(([A-Z]{1,5})\)')
+
+# Institutions fetched concurrently; requests are still paced by _SEC_RATE_LIMITER
+MAX_INSTITUTION_WORKERS = 8
+
+# Parsed holdings buffered between the fetch workers and the consumer
+HOLDINGS_QUEUE_SIZE = 2000
+
+# Holdings saved per transaction by run_ingestion
+SAVE_BATCH_SIZE = 500
+
+# On-disk cache lifetimes (seconds). Filings are immutable once accepted; the
+# submissions index changes whenever the filer files something new.
+SUBMISSIONS_CACHE_TTL = 12 * 3600
+FILING_CACHE_TTL = 90 * 24 * 3600
+
+# SEC's fair-access limit applies per client, so every 13F scraper shares one budget
+_SEC_RATE_LIMITER = TokenBucket(config.api.SEC_RATE_LIMIT)
+
+
+@lru_cache(maxsize=1024)
+def _clean_class_title(title: str) -> str:
+    """Strip the security type suffix (COM, CL A, SHS, ...) from a titleOfClass.
+    
+    Filings draw on a small vocabulary of class titles, so after the first
+    few filings nearly every call is a cache hit instead of a regex run.
+    """
+    return _CLASS_SUFFIX_RE.sub('', title).strip()
+
+
+def _info_table_name(names: Iterator[str]) -> Optional[str]:
+    """Pick the information table out of a 13F filing's document names.
+    
+    It is usually named like form13fInfoTable.xml, but some filers upload it
+    under an arbitrary name; the only other XML document is the cover page
+    (primary_doc.xml).
+    """
+    fallback = None
+    for name in names:
+        lower = name.lower()
+        if not lower.endswith('.xml'):
+            continue
+        if 'infotable' in lower:
+            return name
+        if fallback is None and lower != 'primary_doc.xml':
+            fallback = name
+    return fallback
 
 
 class SEC13FScraper(ScrapingIngester):
@@ -25,6 +99,32 @@ class SEC13FScraper(ScrapingIngester):
         )
         self.session.headers.update(config.api.SEC_HEADERS)
         
+        # EDGAR throttles with 429/503 under load; retry those with short
+        # back-off, and keep a warm connection per worker on www.sec.gov
+        # and data.sec.gov
+        retry_strategy = Retry(
+            total=5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            backoff_factor=0.3,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max(20, MAX_INSTITUTION_WORKERS),
+            max_retries=retry_strategy
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # EDGAR allows SEC_RATE_LIMIT requests per second, far above the scraping default
+        self.min_request_interval = 1.0 / config.api.SEC_RATE_LIMIT
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Filer name -> filer_id, so each institution is looked up once per run
+        self._filer_ids: Dict[str, int] = {}
+        
         # Notable institutional investors to track
         self.tracked_institutions = {
             # Billionaire investors
@@ -55,6 +155,12 @@ class SEC13FScraper(ScrapingIngester):
             'FIDELITY': '0000315066',
         }
     
+    def _rate_limit(self):
+        """Wait for a token from the shared SEC rate limiter."""
+        waited = _SEC_RATE_LIMITER.acquire()
+        if waited:
+            self.logger.debug(f"Rate limiting: waited {waited:.2f} seconds")
+    
     def fetch_recent_trades(self, days: int = 90) -> Iterator[RawTradeData]:
         """Fetch recent 13F filings.
         
@@ -62,37 +168,114 @@ class SEC13FScraper(ScrapingIngester):
         """
         
         # 13F filings are quarterly, get last 2 quarters
-        for name, cik in list(self.tracked_institutions.items())[:5]:  # Start with top 5
-            try:
-                self.logger.info(f"Fetching 13F for {name} (CIK: {cik})")
-                filings = self._get_recent_13f_filings(cik, count=2)
-                
-                for filing in filings:
-                    holdings = self._parse_13f_filing(filing)
-                    
-                    for holding in holdings:
-                        yield self._create_trade_from_holding(holding, name, filing)
-                        
-            except Exception as e:
-                self.logger.warning(f"Failed to process {name}: {e}")
-                continue
+        yield from self._fetch_institutions(
+            self.tracked_institutions.items(),
+            lambda cik: self._get_recent_13f_filings(cik, count=2)
+        )
     
     def fetch_historical_trades(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
         """Fetch historical 13F filings."""
         # 13F filings are quarterly, so date range should span quarters
-        for name, cik in self.tracked_institutions.items():
+        yield from self._fetch_institutions(
+            self.tracked_institutions.items(),
+            lambda cik: self._get_13f_filings_in_range(cik, start_date, end_date)
+        )
+    
+    def _fetch_institutions(self, institutions: Iterable[Tuple[str, str]],
+                            get_filings: Callable[[str], List[Dict]]) -> Iterator[RawTradeData]:
+        """Fetch holdings for several institutions concurrently.
+        
+        Each institution's submissions, filing index and info tables are
+        fetched on a worker thread; the shared SEC rate limiter keeps the
+        combined request rate within EDGAR's limit.
+        
+        Args:
+            institutions: (name, CIK) pairs
+            get_filings: Returns the filings to parse for a CIK
+            
+        Yields:
+            RawTradeData: Holdings, as soon as each info table entry is parsed
+        """
+        institutions = list(institutions)
+        ingested = self._ingested_filings([name for name, _ in institutions])
+        
+        # Workers hand holdings over through a bounded queue, so parsing
+        # pauses rather than piling up while the consumer writes to the DB
+        holdings_queue = queue.Queue(maxsize=HOLDINGS_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+        
+        def produce(name: str, cik: str):
+            try:
+                for trade in self._fetch_institution(name, cik, get_filings, ingested):
+                    if stop.is_set():
+                        break
+                    holdings_queue.put(trade)
+            finally:
+                holdings_queue.put(done)
+        
+        with ThreadPoolExecutor(max_workers=MAX_INSTITUTION_WORKERS) as executor:
+            for name, cik in institutions:
+                executor.submit(produce, name, cik)
+            
+            remaining = len(institutions)
             try:
-                filings = self._get_13f_filings_in_range(cik, start_date, end_date)
+                while remaining:
+                    item = holdings_queue.get()
+                    if item is done:
+                        remaining -= 1
+                    else:
+                        yield item
+            finally:
+                # If the consumer stopped early, unblock the workers and let them finish
+                stop.set()
+                while remaining:
+                    if holdings_queue.get() is done:
+                        remaining -= 1
+    
+    def _fetch_institution(self, name: str, cik: str,
+                           get_filings: Callable[[str], List[Dict]],
+                           ingested: Set[Tuple[str, str]]) -> Iterator[RawTradeData]:
+        """Fetch one institution's holdings, logging rather than raising on failure.
+        
+        Filings listed in ingested (as (name, filing date) pairs) are
+        skipped without downloading them.
+        """
+        try:
+            self.logger.info(f"Fetching 13F for {name} (CIK: {cik})")
+            
+            for filing in get_filings(cik):
+                if (name, filing.get('date')) in ingested:
+                    self.logger.debug(f"Skipping {name} 13F filed {filing.get('date')}: already ingested")
+                    continue
                 
-                for filing in filings:
-                    holdings = self._parse_13f_filing(filing)
-                    
-                    for holding in holdings:
-                        yield self._create_trade_from_holding(holding, name, filing)
-                        
-            except Exception as e:
-                self.logger.warning(f"Failed to process {name}: {e}")
-                continue
+                for holding in self._parse_13f_filing(filing):
+                    yield self._create_trade_from_holding(holding, name, filing)
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to process {name}: {e}")
+    
+    def _ingested_filings(self, names: List[str]) -> Set[Tuple[str, str]]:
+        """Return (institution, filing date) pairs that already have holdings stored.
+        
+        One query for all institutions, so re-runs skip filings that were
+        ingested before instead of downloading and parsing them again.
+        """
+        try:
+            with get_session() as session:
+                rows = session.query(Filer.name, Trade.reported_date).join(
+                    Trade, Trade.filer_id == Filer.filer_id
+                ).filter(
+                    Filer.name.in_(names),
+                    Trade.source == DataSource.SEC_EDGAR,
+                    Trade.source_id.startswith('13f_', autoescape=True)
+                ).distinct()
+                
+                return {(name, reported.isoformat()) for name, reported in rows}
+                
+        except Exception as e:
+            self.logger.warning(f"Failed to check ingested 13F filings: {e}")
+            return set()
     
     def fetch_filer_trades(self, filer_name: str) -> Iterator[RawTradeData]:
         """Fetch 13F filings for specific institution."""
@@ -119,33 +302,40 @@ class SEC13FScraper(ScrapingIngester):
         url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
         
         try:
-            response = self._make_request(url)
-            data = response.json()
+            with self._open_cached(url, SUBMISSIONS_CACHE_TTL) as f:
+                data = self._load_json(f)
             
             # Find 13F-HR filings
             filings = []
             recent_filings = data.get('filings', {}).get('recent', {})
             
-            forms = recent_filings.get('form', [])
-            accession_numbers = recent_filings.get('accessionNumber', [])
-            filing_dates = recent_filings.get('filingDate', [])
-            primary_docs = recent_filings.get('primaryDocument', [])
+            # The recent block is columnar: parallel lists, one entry per filing
+            columns = zip(
+                recent_filings.get('form', []),
+                recent_filings.get('accessionNumber', []),
+                recent_filings.get('filingDate', [])
+            )
             
-            for i, form in enumerate(forms):
-                if form == '13F-HR' and len(filings) < count:
-                    accession = accession_numbers[i].replace('-', '')
-                    filing_date = filing_dates[i] if i < len(filing_dates) else None
-                    primary_doc = primary_docs[i] if i < len(primary_docs) else 'primary_doc.xml'
-                    
-                    # Construct filing URL
-                    filing_url = f"https://www.sec.gov/cgi-bin/viewer?action=view&cik={cik_padded}&accession_number={accession_numbers[i]}&xbrl_type=v"
-                    
-                    filings.append({
-                        'url': filing_url,
-                        'date': filing_date,
-                        'accession': accession_numbers[i],
-                        'cik': cik_padded
-                    })
+            # Filings are listed newest first, so stop at the count'th 13F-HR
+            # instead of scanning the filer's whole history
+            for form, accession_number, filing_date in columns:
+                if form != '13F-HR':
+                    continue
+                if len(filings) >= count:
+                    break
+                
+                accession = accession_number.replace('-', '')
+                
+                # Construct filing URL
+                filing_url = f"https://www.sec.gov/cgi-bin/viewer?action=view&cik={cik_padded}&accession_number={accession_number}&xbrl_type=v"
+                
+                filings.append({
+                    'url': filing_url,
+                    'archive_url': f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{accession}",
+                    'date': filing_date,
+                    'accession': accession_number,
+                    'cik': cik_padded
+                })
             
             return filings
             
@@ -161,87 +351,67 @@ class SEC13FScraper(ScrapingIngester):
         
         return self._get_recent_13f_filings(cik, count=max(quarters_back, 1))
     
-    def _parse_13f_filing(self, filing: Dict) -> List[Dict]:
+    def _parse_13f_filing(self, filing: Dict) -> Iterator[Dict]:
         """Parse 13F-HR filing to extract holdings.
         
         13F filings contain a table of all holdings >$200k or 10k shares.
         """
         
-        holdings = []
-        
         try:
-            # Get the filing page
-            response = self._make_request(filing['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the information table (primary document)
-            # Look for .xml or .txt files containing holdings
-            doc_links = soup.find_all('a', href=re.compile(r'\.xml$|primary_doc\.xml'))
+            # The archive's index.json lists the filing's documents directly
+            with self._open_cached(f"{filing['archive_url']}/index.json", FILING_CACHE_TTL) as f:
+                index = self._load_json(f)
             
-            if not doc_links:
-                # Try alternate format
-                doc_links = soup.find_all('a', href=re.compile(r'form13fInfoTable\.xml'))
+            doc_name = _info_table_name(item.get('name', '') for item in index['directory']['item'])
             
-            if doc_links:
+            if doc_name:
                 # Parse the information table XML
-                doc_url = filing['url'].rsplit('/', 1)[0] + '/' + doc_links[0]['href']
-                holdings = self._parse_13f_info_table(doc_url)
+                yield from self._parse_13f_info_table(f"{filing['archive_url']}/{doc_name}")
             
         except Exception as e:
             self.logger.warning(f"Failed to parse 13F filing: {e}")
-        
-        return holdings
     
-    def _parse_13f_info_table(self, url: str) -> List[Dict]:
-        """Parse 13F information table XML."""
+    def _parse_13f_info_table(self, url: str) -> Iterator[Dict]:
+        """Parse 13F information table XML.
         
-        holdings = []
+        The table is streamed from the on-disk cache and each holding is
+        yielded as soon as its infoTable entry ends, then freed, so memory
+        stays flat even for the largest filers.
+        """
         
         try:
-            response = self._make_request(url)
-            root = ET.fromstring(response.text)
-            
-            # Find all info table entries
-            # XML structure varies, but typically has infoTable elements
-            for entry in root.findall('.//{http://www.sec.gov/edgar/document/thirteenf/informationtable}infoTable'):
-                holding = {}
-                
-                # Extract security name and ticker
-                name_elem = entry.find('.//{http://www.sec.gov/edgar/document/thirteenf/informationtable}nameOfIssuer')
-                ticker_elem = entry.find('.//{http://www.sec.gov/edgar/document/thirteenf/informationtable}titleOfClass')
+            with self._open_cached(url, FILING_CACHE_TTL) as f:
+                # Entries are namespaced in current filings, bare in older ones
+                entries = etree.iterparse(f, events=('end',),
+                                          tag=(f'{INFO_TABLE_NS}infoTable', 'infoTable'))
                 
-                # Extract position details
-                shares_elem = entry.find('.//{http://www.sec.gov/edgar/document/thirteenf/informationtable}sshPrnamt')
-                value_elem = entry.find('.//{http://www.sec.gov/edgar/document/thirteenf/informationtable}value')
-                
-                if name_elem is not None and shares_elem is not None:
-                    holding = {
-                        'name': name_elem.text,
-                        'ticker': ticker_elem.text if ticker_elem is not None else '',
-                        'shares': int(shares_elem.text) if shares_elem.text else 0,
-                        'value': int(value_elem.text) * 1000 if value_elem is not None and value_elem.text else 0  # Value in thousands
-                    }
-                    holdings.append(holding)
-            
-            # Try alternate XML structure (older format)
-            if not holdings:
-                for entry in root.findall('.//infoTable'):
-                    name_elem = entry.find('.//nameOfIssuer')
-                    shares_elem = entry.find('.//sshPrnamt')
-                    value_elem = entry.find('.//value')
+                for _, entry in entries:
+                    name_xpath, ticker_xpath, shares_xpath, value_xpath = \
+                        _INFO_TABLE_XPATHS[INFO_TABLE_NS if entry.tag.startswith('{') else '']
+                    
+                    # Extract security name and ticker
+                    name = name_xpath(entry)
+                    ticker = ticker_xpath(entry)
                     
-                    if name_elem is not None and shares_elem is not None:
-                        holdings.append({
-                            'name': name_elem.text,
-                            'ticker': '',
-                            'shares': int(shares_elem.text),
-                            'value': int(value_elem.text) * 1000 if value_elem is not None else 0
-                        })
+                    # Extract position details
+                    shares = shares_xpath(entry)
+                    value = value_xpath(entry)
+                    
+                    if name and not math.isnan(shares):
+                        yield {
+                            'name': name[0],
+                            'ticker': ticker[0] if ticker else '',
+                            'shares': int(shares),
+                            'value': int(value) * 1000 if not math.isnan(value) else 0  # Value in thousands
+                        }
+                    
+                    # Entries are independent; drop this one and any earlier siblings
+                    entry.clear(keep_tail=True)
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
             
         except Exception as e:
             self.logger.error(f"Failed to parse info table: {e}")
-        
-        return holdings
     
     def _create_trade_from_holding(self, holding: Dict, institution: str, filing: Dict) -> RawTradeData:
         """Create trade data from 13F holding.
@@ -258,12 +428,12 @@ class SEC13FScraper(ScrapingIngester):
         
         # Clean up ticker (often includes security type like "COM", "CL A", etc.)
         ticker = holding.get('ticker', '')
-        ticker = re.sub(r'\s+(COM|CL [A-Z]|SHS).*', '', ticker).strip()
+        ticker = _clean_class_title(ticker)
         
         # Try to extract ticker from name if not available
         if not ticker:
             # Common pattern: "COMPANY NAME (TICKER)"
-            match = re.search(r'\(([A-Z]{1,5})\)', holding['name'])
+            match = _NAME_TICKER_RE.search(holding['name'])
             if match:
                 ticker = match.group(1)
         
@@ -307,17 +477,24 @@ class SEC13FScraper(ScrapingIngester):
             trades_processed = 0
             errors = 0
             
-            # Fetch trades
+            batch = []
+            self._preload_filer_ids()
+            
+            # Fetch trades, saving them SAVE_BATCH_SIZE at a time
             for trade_data in self.fetch_recent_trades(days):
                 trades_processed += 1
+                batch.append(trade_data)
                 
-                # Save to database
-                try:
-                    self._save_trade(trade_data)
-                    trades_collected += 1
-                except Exception as e:
-                    self.logger.warning(f"Failed to save trade: {e}")
-                    errors += 1
+                if len(batch) >= SAVE_BATCH_SIZE:
+                    saved, failed = self._save_batch(batch)
+                    trades_collected += saved
+                    errors += failed
+                    batch = []
+            
+            if batch:
+                saved, failed = self._save_batch(batch)
+                trades_collected += saved
+                errors += failed
             
             end_time = datetime.now()
             runtime = (end_time - start_time).total_seconds()
@@ -338,48 +515,103 @@ class SEC13FScraper(ScrapingIngester):
             self.logger.error(f"Ingestion failed: {e}")
             raise IngestionError(f"13F ingestion failed: {e}")
     
-    def _save_trade(self, trade_data: RawTradeData):
-        """Save 13F holding to database as institutional position."""
+    def _save_batch(self, batch: List[RawTradeData]) -> Tuple[int, int]:
+        """Save a batch of holdings, logging rather than raising on failure.
+        
+        Returns:
+            Tuple of (holdings collected, holdings that failed to save)
+        """
+        try:
+            self._save_trades(batch)
+            return len(batch), 0
+        except Exception as e:
+            self.logger.warning(f"Failed to save {len(batch)} holdings: {e}")
+            # Filers created in the rolled-back transaction are gone
+            self._filer_ids.clear()
+            return 0, len(batch)
+    
+    def _preload_filer_ids(self):
+        """Cache the filer ids of all tracked institutions with one query."""
+        try:
+            with get_session() as session:
+                self._filer_ids.update(
+                    session.query(Filer.name, Filer.filer_id).filter(
+                        Filer.name.in_(list(self.tracked_institutions))
+                    )
+                )
+        except Exception as e:
+            self.logger.warning(f"Failed to preload filers: {e}")
+    
+    def _get_filer_ids(self, session, names: Iterable[str]) -> Dict[str, int]:
+        """Return the filer id cache, after adding any of names not yet in it.
+        
+        Names missing from the cache are looked up with one query, and those
+        not in the database are created with a single flush.
+        """
+        missing = set(names) - self._filer_ids.keys()
+        if not missing:
+            return self._filer_ids
+        
+        self._filer_ids.update(
+            session.query(Filer.name, Filer.filer_id).filter(Filer.name.in_(missing))
+        )
+        
+        new_filers = [
+            Filer(
+                name=name,
+                filer_type=FilerType.HEDGE_FUND
+            )
+            for name in missing - self._filer_ids.keys()
+        ]
+        if new_filers:
+            session.add_all(new_filers)
+            session.flush()
+            self._filer_ids.update((f.name, f.filer_id) for f in new_filers)
+        
+        return self._filer_ids
+    
+    def _save_trades(self, trades: List[RawTradeData]):
+        """Save 13F holdings to database as institutional positions.
+        
+        At most one filer query, one existence query and one bulk insert per
+        batch, all in a single transaction.
+        """
+        
+        # Identical holdings within a filing share a source_id; keep the first
+        trades = list({t.source_id: t for t in reversed(trades)}.values())
         
         with get_session() as session:
-            # Get or create filer
-            filer = session.query(Filer).filter(Filer.name == trade_data.filer_name).first()
+            # Get or create filers
+            filer_ids = self._get_filer_ids(session, {t.filer_name for t in trades})
             
-            if not filer:
-                filer = Filer(
-                    name=trade_data.filer_name,
-                    filer_type=FilerType.HEDGE_FUND
+            # Check which holdings exist
+            existing = {
+                source_id for (source_id,) in session.query(Trade.source_id).filter(
+                    Trade.source == DataSource.SEC_EDGAR,
+                    Trade.source_id.in_([t.source_id for t in trades])
                 )
-                session.add(filer)
-                session.flush()
-            
-            # Check if holding exists
-            existing = session.query(Trade).filter(
-                Trade.source == DataSource.SEC_EDGAR,
-                Trade.source_id == trade_data.source_id
-            ).first()
-            
-            if existing:
-                return
-            
-            # Create trade
-            trade = Trade(
-                filer_id=filer.filer_id,
-                source=DataSource.SEC_EDGAR,
-                source_id=trade_data.source_id,
-                reported_date=trade_data.reported_date,
-                trade_date=trade_data.trade_date,
-                ticker=trade_data.ticker,
-                company_name=trade_data.company_name,
-                transaction_type=TransactionType.BUY,
-                quantity=Decimal(str(trade_data.quantity)) if trade_data.quantity else None,
-                amount_usd=Decimal(str(trade_data.amount_usd)) if trade_data.amount_usd else None,
-                filing_url=trade_data.raw_data.get('filing_url'),
-                raw_data=trade_data.raw_data
-            )
+            }
             
-            session.add(trade)
-            session.commit()
+            # Create trades
+            session.bulk_insert_mappings(Trade, [
+                {
+                    'filer_id': filer_ids[trade_data.filer_name],
+                    'source': DataSource.SEC_EDGAR,
+                    'source_id': trade_data.source_id,
+                    'reported_date': trade_data.reported_date,
+                    'trade_date': trade_data.trade_date,
+                    'ticker': trade_data.ticker,
+                    'company_name': trade_data.company_name,
+                    'transaction_type': TransactionType.BUY,
+                    # Whole numbers from the info table; Numeric columns bind ints exactly
+                    'quantity': trade_data.quantity or None,
+                    'amount_usd': trade_data.amount_usd or None,
+                    'filing_url': trade_data.raw_data.get('filing_url'),
+                    'raw_data': trade_data.raw_data
+                }
+                for trade_data in trades
+                if trade_data.source_id not in existing
+            ])
 
 
 # Test function
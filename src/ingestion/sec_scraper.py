@@ -1,26 +1,206 @@
 """SEC EDGAR scraper for corporate insider trading disclosures."""
 
-import xml.etree.ElementTree as ET
+import csv
+import io
 import re
 import json
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Iterator, Union, Any
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Iterator, Tuple, Union, Any
+from collections import deque
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import urllib3
+from lxml import etree
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from config.config import config
 from src.database import get_session, Filer, Trade, FilerType, TransactionType, DataSource
 from .base import APIIngester, RawTradeData, IngestionError
 
 
+# Filing documents downloaded concurrently; requests are still paced by the rate limiter
+MAX_FILING_WORKERS = 8
+
+# Daily indexes fetched ahead of the day whose filings are being processed
+INDEX_PREFETCH_DAYS = 4
+
+# On-disk cache lifetimes (seconds). Archived indexes and filings are
+# immutable; the submissions index changes whenever the filer files something.
+ARCHIVE_CACHE_TTL = 365 * 24 * 3600
+RECENT_INDEX_CACHE_TTL = 3600
+SUBMISSIONS_CACHE_TTL = 3600
+
+# Trades written per transaction by SECScraper
+SAVE_BATCH_SIZE = 1000
+
+# Common patterns for tickers in security titles, matched against the upper-cased title
+_TICKER_RES = (
+    re.compile(r'\b([A-Z]{1,5})\b'),  # 1-5 uppercase letters
+    re.compile(r'TICKER[:\s]+([A-Z]+)'),  # "ticker: AAPL"
+    re.compile(r'SYMBOL[:\s]+([A-Z]+)')   # "symbol: AAPL"
+)
+
+# Thousands separators and whitespace inside numeric fields
+_FLOAT_CLEAN_RE = re.compile(r'[,\s]')
+
+# SEC transaction codes mapped to our standard types
+_CODE_MAP = {
+    'P': 'buy',      # Purchase
+    'S': 'sell',     # Sale
+    'A': 'buy',      # Grant/Award
+    'D': 'sell',     # Disposition
+    'F': 'sell',     # Payment of exercise price or tax liability
+    'I': 'buy',      # Discretionary transaction
+    'M': 'buy',      # Exercise or conversion
+    'C': 'sell',     # Conversion
+    'E': 'sell',     # Expiration
+    'H': 'buy',      # Expiration (short position)
+    'O': 'buy',      # Exercise of out-of-the-money option
+    'X': 'sell'      # Exercise of in-the-money option
+}
+
+# Values accepted by TransactionType, checked for every saved trade
+_TRANSACTION_TYPE_VALUES = frozenset(t.value for t in TransactionType)
+
+# Failures that skip a single filing: download errors (including ones raised
+# while streaming the body), cache I/O and truncated cache files, bad
+# accession numbers and unparseable XML. Anything else is a bug and propagates.
+_FILING_ERRORS = (
+    IngestionError,
+    requests.RequestException,
+    urllib3.exceptions.HTTPError,
+    OSError,
+    EOFError,
+    ValueError,
+    etree.XMLSyntaxError,
+)
+
+# Filing bodies are read in chunks of this many bytes
+FILING_CHUNK_SIZE = 16384
+
+# Fences around the ownership document embedded in a filing; EDGAR always
+# writes them in upper case, so a plain bytes search finds them
+_XML_OPEN = b'<XML>'
+_XML_CLOSE = b'</XML>'
+
+# Transactions in an ownership document; holdings rows are not transactions
+_TRANSACTIONS_XPATH = etree.XPath(
+    './/nonDerivativeTable/nonDerivativeTransaction | .//derivativeTable/derivativeTransaction'
+)
+
+# Transaction dict keys and their paths relative to a transaction element
+_TRANSACTION_FIELDS = (
+    ('date', 'transactionDate/value'),
+    ('code', 'transactionCoding/transactionCode'),
+    ('security', 'securityTitle/value'),
+    ('shares', 'transactionAmounts/transactionShares/value'),
+    ('price', 'transactionAmounts/transactionPricePerShare/value'),
+    ('acquired_disposed', 'transactionAmounts/transactionAcquiredDisposedCode/value'),
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_sec_date_cached(date_str: str) -> Optional[date]:
+    """Parse an SEC date string, or return None; dates repeat heavily, so cache them."""
+    # SEC typically uses YYYY-MM-DD format, which fromisoformat parses in C
+    try:
+        return date.fromisoformat(date_str)
+    except ValueError:
+        pass
+    
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):  # Unpadded ISO, then the alternative format
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    
+    return None
+
+
+def _read_xml_section(chunks: Iterable[bytes]) -> Optional[etree._Element]:
+    """Parse the <XML> section of a filing from its body chunks.
+    
+    The section is fed to an incremental parser chunk by chunk, so the
+    filing is never held in memory as a whole. Chunks after </XML> are read
+    but not parsed, which leaves a streamed connection reusable.
+    
+    Returns:
+        Root element of the ownership document, or None if the filing has no complete XML section
+    """
+    parser = None
+    state = 'head'
+    pending = b''
+    
+    for chunk in chunks:
+        if state == 'tail':
+            continue
+        
+        pending += chunk
+        
+        if state == 'head':
+            start = pending.find(_XML_OPEN)
+            if start == -1:
+                # Keep enough bytes to catch a fence split across chunks
+                pending = pending[-(len(_XML_OPEN) - 1):]
+                continue
+            pending = pending[start + len(_XML_OPEN):]
+            state = 'lead'
+        
+        if state == 'lead':
+            # The XML declaration must come first, so skip the whitespace before it
+            pending = pending.lstrip()
+            if not pending:
+                continue
+            # Tolerates the occasional malformed ownership document instead of dropping it
+            parser = etree.XMLParser(huge_tree=True, recover=True)
+            state = 'body'
+        
+        end = pending.find(_XML_CLOSE)
+        if end != -1:
+            parser.feed(pending[:end])
+            state = 'tail'
+        elif len(pending) >= len(_XML_CLOSE):
+            # Hold back a possibly split </XML>
+            keep = len(_XML_CLOSE) - 1
+            parser.feed(pending[:-keep])
+            pending = pending[-keep:]
+    
+    if state != 'tail':
+        return None
+    
+    return parser.close()
+
+
+def _find_first(elem, *paths: str):
+    """Return the first element matched by any of paths, or None."""
+    for path in paths:
+        found = elem.find(path)
+        if found is not None:
+            return found
+    return None
+
+
 class SECEdgarScraper(APIIngester):
     """Scraper for SEC EDGAR insider trading forms."""
     
-    def __init__(self):
+    def __init__(self, keep_raw: bool = False):
+        """Initialize the scraper.
+        
+        Args:
+            keep_raw: Attach the parsed filer, transaction and filing dicts to
+                each trade as raw_data; off by default to keep backfills lean
+        """
         super().__init__(
             name="sec_edgar",
             base_url=config.api.SEC_EDGAR_BASE_URL,
-            rate_limit=config.api.SEC_RATE_LIMIT
+            rate_limit=config.api.SEC_RATE_LIMIT * 60  # SEC_RATE_LIMIT is per second
         )
         
         # SEC requires specific headers
@@ -28,6 +208,11 @@ class SECEdgarScraper(APIIngester):
         
         # Form types we're interested in
         self.form_types = ["3", "4", "5"]  # Initial, Changes, Annual
+        self._form_types_set = frozenset(self.form_types)
+        
+        self.keep_raw = keep_raw
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Common XML namespaces used in SEC filings
         self.xml_namespaces = {
@@ -43,33 +228,20 @@ class SECEdgarScraper(APIIngester):
         end_date = date.today() - timedelta(days=5)
         start_date = end_date - timedelta(days=days)
         
-        for current_date in self._date_range(start_date, end_date):
-            try:
-                filings = self._get_daily_filings(current_date)
-                
-                for filing in filings:
-                    if filing.get('form') in self.form_types:
-                        trades = self._process_filing(filing)
-                        for trade in trades:
-                            yield trade
-                            
-            except Exception as e:
-                self.logger.warning(f"Failed to process filings for {current_date}: {e}")
-                continue
+        yield from self._iter_trades_for_range(start_date, end_date)
     
     def fetch_historical_trades(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
         """Fetch historical insider trades for date range."""
         
-        for current_date in self._date_range(start_date, end_date):
+        yield from self._iter_trades_for_range(start_date, end_date)
+    
+    def _iter_trades_for_range(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
+        """Yield trades from the insider filings of each day in the range."""
+        
+        for current_date, filings in self._iter_daily_filings(self._date_range(start_date, end_date)):
             try:
-                filings = self._get_daily_filings(current_date)
+                yield from self._process_filings(filings)
                 
-                for filing in filings:
-                    if filing.get('form') in self.form_types:
-                        trades = self._process_filing(filing)
-                        for trade in trades:
-                            yield trade
-                            
             except Exception as e:
                 self.logger.warning(f"Failed to process filings for {current_date}: {e}")
                 continue
@@ -83,8 +255,8 @@ class SECEdgarScraper(APIIngester):
         try:
             # Get company filings
             url = f"{self.base_url}/submissions/CIK{cik}.json"
-            response = self._make_request(url)
-            company_data = response.json()
+            with self._open_cached(url, SUBMISSIONS_CACHE_TTL) as f:
+                company_data = self._load_json(f)
             
             # Process recent filings
             filings = company_data.get('filings', {}).get('recent', {})
@@ -110,6 +282,40 @@ class SECEdgarScraper(APIIngester):
         except Exception as e:
             self.logger.error(f"Failed to fetch trades for CIK {cik}: {e}")
     
+    def _process_filings(self, filings: List[Dict]) -> Iterator[RawTradeData]:
+        """Download and parse insider filings concurrently.
+        
+        Filing downloads are independent, so up to MAX_FILING_WORKERS run at
+        once; the shared rate limiter keeps the overall request rate within
+        SEC's limit. Trades are yielded in filing order.
+        """
+        filings = [f for f in filings if f.get('form') in self.form_types]
+        if not filings:
+            return
+        
+        with ThreadPoolExecutor(max_workers=MAX_FILING_WORKERS) as executor:
+            for trades in executor.map(self._process_filing, filings):
+                yield from trades
+    
+    def _iter_daily_filings(self, dates: Iterable[date]) -> Iterator[Tuple[date, List[Dict]]]:
+        """Yield (date, filings) for each date, fetching daily indexes ahead.
+        
+        Up to INDEX_PREFETCH_DAYS indexes download in the background while the
+        caller processes earlier days' filings, so index round trips overlap
+        filing downloads instead of adding to them.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=INDEX_PREFETCH_DAYS) as executor:
+            for filing_date in dates:
+                pending.append((filing_date, executor.submit(self._get_daily_filings, filing_date)))
+                if len(pending) >= INDEX_PREFETCH_DAYS:
+                    filing_date, future = pending.popleft()
+                    yield filing_date, future.result()
+            
+            while pending:
+                filing_date, future = pending.popleft()
+                yield filing_date, future.result()
+    
     def _get_daily_filings(self, filing_date: date) -> List[Dict]:
         """Get all filings for a specific date."""
         
@@ -120,45 +326,48 @@ class SECEdgarScraper(APIIngester):
         
         index_url = f"{self.base_url}/Archives/edgar/daily-index/{year}/{quarter}/master.{date_str}.idx"
         
+        # Past indexes never change; the last few days may still be republished
+        if filing_date < date.today() - timedelta(days=5):
+            ttl = ARCHIVE_CACHE_TTL
+        else:
+            ttl = RECENT_INDEX_CACHE_TTL
+        
         try:
-            response = self._make_request(index_url)
-            return self._parse_daily_index(response.text, filing_date)
+            # Served without a charset, which requests decodes as ISO-8859-1
+            with self._open_cached(index_url, ttl) as f:
+                return self._parse_daily_index(io.TextIOWrapper(f, encoding='latin-1', newline=''), filing_date)
             
         except Exception as e:
             self.logger.warning(f"Failed to get daily index for {filing_date}: {e}")
             return []
     
-    def _parse_daily_index(self, index_content: str, filing_date: date) -> List[Dict]:
-        """Parse SEC daily index file."""
+    def _parse_daily_index(self, index_lines: Iterable[str], filing_date: date) -> List[Dict]:
+        """Parse SEC daily index file, given as an iterable of lines."""
         
         filings = []
-        lines = index_content.split('\n')
+        
+        # Pipe-delimited, unquoted (company names may contain '"')
+        rows = csv.reader(index_lines, delimiter='|', quoting=csv.QUOTE_NONE)
         
         # Skip header lines (usually first 10 lines are header)
-        data_lines = lines[10:]
+        for _ in range(10):
+            next(rows, None)
         
-        for line in data_lines:
-            if not line.strip():
+        for row in rows:
+            # Filter for insider trading forms first; Forms 3/4/5 are a small
+            # minority of the index, so most rows need no further work
+            if len(row) < 5 or row[2] not in self._form_types_set:
                 continue
-                
-            parts = line.split('|')
-            if len(parts) >= 5:
-                cik = parts[0].strip()
-                company_name = parts[1].strip()
-                form_type = parts[2].strip()
-                date_filed = parts[3].strip()
-                filename = parts[4].strip()
-                
-                # Filter for insider trading forms
-                if form_type in self.form_types:
-                    filings.append({
-                        'cik': cik,
-                        'companyName': company_name,
-                        'form': form_type,
-                        'filingDate': date_filed,
-                        'filename': filename,
-                        'url': f"{self.base_url}/Archives/{filename}"
-                    })
+            
+            filename = row[4].strip()
+            filings.append({
+                'cik': row[0].strip(),
+                'companyName': row[1].strip(),
+                'form': row[2],
+                'filingDate': row[3].strip(),
+                'filename': filename,
+                'url': f"{self.base_url}/Archives/{filename}"
+            })
         
         return filings
     
@@ -174,36 +383,26 @@ class SECEdgarScraper(APIIngester):
                 cik = filing_info.get('cik', '').zfill(10)
                 filing_url = f"{self.base_url}/Archives/edgar/data/{int(cik)}/{accession}/{accession}.txt"
             
-            response = self._make_request(filing_url)
+            # Parse the XML section chunk by chunk; accepted filings never change
+            with self._open_cached(filing_url, ARCHIVE_CACHE_TTL) as f:
+                root = _read_xml_section(iter(lambda: f.read(FILING_CHUNK_SIZE), b''))
             
             # Parse the filing (can be XML or text format)
-            if '<XML>' in response.text.upper():
-                return self._parse_xml_filing(response.text, filing_info)
+            if root is not None:
+                return self._parse_xml_filing(root, filing_info)
             else:
-                return self._parse_text_filing(response.text, filing_info)
+                return self._parse_text_filing(filing_info)
                 
-        except Exception as e:
-            self.logger.warning(f"Failed to process filing {filing_info.get('accessionNumber', '')}: {e}")
+        except _FILING_ERRORS as e:
+            self.logger.warning("Failed to process filing %s: %s", filing_info.get('accessionNumber', ''), e)
             return []
     
-    def _parse_xml_filing(self, content: str, filing_info: Dict) -> List[RawTradeData]:
+    def _parse_xml_filing(self, root: etree._Element, filing_info: Dict) -> List[RawTradeData]:
         """Parse XML format SEC filing."""
         
         trades = []
         
         try:
-            # Extract XML section
-            xml_start = content.upper().find('<XML>')
-            xml_end = content.upper().find('</XML>')
-            
-            if xml_start == -1 or xml_end == -1:
-                return trades
-            
-            xml_content = content[xml_start + 5:xml_end]
-            
-            # Parse XML
-            root = ET.fromstring(xml_content)
-            
             # Extract filer information
             filer_info = self._extract_filer_info(root)
             
@@ -219,12 +418,12 @@ class SECEdgarScraper(APIIngester):
                 if trade_data:
                     trades.append(trade_data)
                     
-        except Exception as e:
-            self.logger.warning(f"XML parsing error: {e}")
+        except (ValueError, TypeError, KeyError) as e:
+            self.logger.warning("XML parsing error in filing %s: %s", filing_info.get('accessionNumber', ''), e)
         
         return trades
     
-    def _parse_text_filing(self, content: str, filing_info: Dict) -> List[RawTradeData]:
+    def _parse_text_filing(self, filing_info: Dict) -> List[RawTradeData]:
         """Parse text format SEC filing (older format)."""
         
         # This is more complex as text filings have various formats
@@ -232,68 +431,50 @@ class SECEdgarScraper(APIIngester):
         self.logger.debug("Text filing parsing not yet implemented")
         return []
     
-    def _extract_filer_info(self, root: ET.Element) -> Dict:
+    def _extract_filer_info(self, root: etree._Element) -> Dict:
         """Extract filer information from XML."""
         
         filer_info = {}
         
-        # Try to find reporting owner info
-        for elem in root.iter():
+        # Try to find reporting owner info (elements only; skip comments/PIs)
+        for elem in root.iter(tag=etree.Element):
             tag = elem.tag.lower()
             
             if 'reportingowner' in tag or 'rptowner' in tag:
                 # Get name
-                name_elem = elem.find('.//rptOwnerName') or elem.find('.//reportingOwnerName')
+                name_elem = _find_first(elem, './/rptOwnerName', './/reportingOwnerName')
                 if name_elem is not None:
                     filer_info['name'] = name_elem.text
                 
                 # Get title/relationship
-                title_elem = elem.find('.//officerTitle') or elem.find('.//directorTitle')
+                title_elem = _find_first(elem, './/officerTitle', './/directorTitle')
                 if title_elem is not None:
                     filer_info['title'] = title_elem.text
                 
                 # Get CIK
-                cik_elem = elem.find('.//rptOwnerCik') or elem.find('.//reportingOwnerCik')
+                cik_elem = _find_first(elem, './/rptOwnerCik', './/reportingOwnerCik')
                 if cik_elem is not None:
                     filer_info['cik'] = cik_elem.text
         
         return filer_info
     
-    def _extract_transactions(self, root: ET.Element) -> List[Dict]:
+    def _extract_transactions(self, root: etree._Element) -> List[Dict]:
         """Extract transaction information from XML."""
         
         transactions = []
         
-        # Look for non-derivative and derivative transactions
-        for transaction_type in ['nonderivativeTable', 'derivativeTable']:
+        # Non-derivative and derivative transactions, in document order
+        for elem in _TRANSACTIONS_XPATH(root):
+            transaction = {}
             
-            # Find transaction elements
-            for elem in root.iter():
-                tag = elem.tag.lower()
-                
-                if 'transaction' in tag and transaction_type.lower() in elem.getparent().tag.lower():
-                    
-                    transaction = {}
-                    
-                    # Extract transaction details
-                    for child in elem.iter():
-                        child_tag = child.tag.lower()
-                        
-                        if 'transactiondate' in child_tag:
-                            transaction['date'] = child.text
-                        elif 'transactioncode' in child_tag:
-                            transaction['code'] = child.text
-                        elif 'securitytitle' in child_tag:
-                            transaction['security'] = child.text
-                        elif 'transactionshares' in child_tag:
-                            transaction['shares'] = child.text
-                        elif 'transactionpricepershare' in child_tag:
-                            transaction['price'] = child.text
-                        elif 'transactionacquireddisposed' in child_tag:
-                            transaction['acquired_disposed'] = child.text
-                    
-                    if transaction:
-                        transactions.append(transaction)
+            # Extract transaction details (most values sit in a <value> child)
+            for key, path in _TRANSACTION_FIELDS:
+                text = elem.findtext(path)
+                if text is not None:
+                    transaction[key] = text.strip()
+            
+            if transaction:
+                transactions.append(transaction)
         
         return transactions
     
@@ -304,7 +485,7 @@ class SECEdgarScraper(APIIngester):
         try:
             # Determine transaction type
             transaction_code = transaction.get('code', '').upper()
-            transaction_type = self._map_transaction_code(transaction_code)
+            transaction_type = _CODE_MAP.get(transaction_code)
             
             if not transaction_type:
                 return None
@@ -339,48 +520,23 @@ class SECEdgarScraper(APIIngester):
                     'filer_info': filer_info,
                     'transaction': transaction,
                     'filing_info': filing_info
-                }
+                } if self.keep_raw else None
             )
             
-        except Exception as e:
-            self.logger.warning(f"Failed to create trade data: {e}")
+        except (ValueError, TypeError, KeyError) as e:
+            self.logger.warning("Failed to create trade data for filing %s: %s", filing_info.get('accessionNumber', ''), e)
             return None
     
-    def _map_transaction_code(self, code: str) -> Optional[str]:
-        """Map SEC transaction codes to our standard types."""
-        
-        code_mapping = {
-            'P': 'buy',      # Purchase
-            'S': 'sell',     # Sale
-            'A': 'buy',      # Grant/Award
-            'D': 'sell',     # Disposition
-            'F': 'sell',     # Payment of exercise price or tax liability
-            'I': 'buy',      # Discretionary transaction
-            'M': 'buy',      # Exercise or conversion
-            'C': 'sell',     # Conversion
-            'E': 'sell',     # Expiration
-            'H': 'buy',      # Expiration (short position)
-            'O': 'buy',      # Exercise of out-of-the-money option
-            'X': 'sell'      # Exercise of in-the-money option
-        }
-        
-        return code_mapping.get(code)
-    
     def _extract_ticker(self, security_title: str) -> Optional[str]:
         """Extract ticker symbol from security title."""
         
         if not security_title:
             return None
         
-        # Common patterns for tickers in security titles
-        ticker_patterns = [
-            r'\b([A-Z]{1,5})\b',  # 1-5 uppercase letters
-            r'ticker[:\s]+([A-Z]+)',  # "ticker: AAPL"
-            r'symbol[:\s]+([A-Z]+)'   # "symbol: AAPL"
-        ]
+        security_title = security_title.upper()
         
-        for pattern in ticker_patterns:
-            match = re.search(pattern, security_title.upper())
+        for pattern in _TICKER_RES:
+            match = pattern.search(security_title)
             if match:
                 return match.group(1)
         
@@ -392,16 +548,10 @@ class SECEdgarScraper(APIIngester):
         if not date_str:
             return None
         
-        try:
-            # SEC typically uses YYYY-MM-DD format
-            return datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            try:
-                # Alternative format
-                return datetime.strptime(date_str, "%m/%d/%Y").date()
-            except ValueError:
-                self.logger.warning(f"Could not parse SEC date: {date_str}")
-                return None
+        parsed = _parse_sec_date_cached(date_str)
+        if parsed is None:
+            self.logger.warning("Could not parse SEC date: %s", date_str)
+        return parsed
     
     def _parse_float(self, value_str: Optional[str]) -> Optional[float]:
         """Parse float value from string."""
@@ -411,18 +561,15 @@ class SECEdgarScraper(APIIngester):
         
         try:
             # Remove commas and convert to float
-            clean_value = re.sub(r'[,\s]', '', str(value_str))
+            clean_value = _FLOAT_CLEAN_RE.sub('', str(value_str))
             return float(clean_value)
         except ValueError:
             return None
     
-    def _date_range(self, start_date: date, end_date: date) -> Iterator[date]:
-        """Generate date range."""
+    def _date_range(self, start_date: date, end_date: date) -> List[date]:
+        """Return every date from start_date to end_date inclusive."""
         
-        current = start_date
-        while current <= end_date:
-            yield current
-            current += timedelta(days=1)
+        return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
 
 
 class SECScraper:
@@ -431,6 +578,9 @@ class SECScraper:
     def __init__(self):
         self.edgar_scraper = SECEdgarScraper()
         self.logger = self.edgar_scraper.logger
+        
+        # (name, filer type) -> filer_id for filers already seen this run
+        self._filer_cache: Dict[Tuple[str, FilerType], int] = {}
     
     def run_full_ingestion(self, days: int = 7) -> Dict[str, Any]:
         """Run SEC ingestion (shorter default period due to data volume)."""
@@ -449,69 +599,120 @@ class SECScraper:
             return {"error": str(e)}
     
     def _save_trades_to_db(self, trades_iter: Iterator[RawTradeData]):
-        """Save trades to database."""
+        """Save trades to database in batches of SAVE_BATCH_SIZE."""
         
-        with get_session() as session:
-            for trade_data in trades_iter:
-                try:
-                    # Get or create filer
-                    filer = self._get_or_create_filer(session, trade_data)
-                    
-                    # Check if trade already exists
-                    existing_trade = session.query(Trade).filter(
+        batch = []
+        for trade_data in trades_iter:
+            batch.append(trade_data)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                self._save_batch(batch)
+                batch = []
+        
+        if batch:
+            self._save_batch(batch)
+    
+    def _save_batch(self, batch: List[RawTradeData]):
+        """Save one batch of trades in its own transaction.
+        
+        At most one filer query, one existence query and one bulk insert per
+        batch, instead of several round trips per trade.
+        """
+        
+        # Duplicate filings within a batch share a source_id; keep the first
+        trades = list({t.source_id: t for t in reversed(batch)}.values())
+        
+        try:
+            with get_session() as session:
+                # Get or create filers
+                filer_ids = self._get_filer_ids(session, trades)
+                
+                # Check which trades exist
+                existing = {
+                    source_id for (source_id,) in session.query(Trade.source_id).filter(
                         Trade.source == DataSource.SEC_EDGAR,
-                        Trade.source_id == trade_data.source_id
-                    ).first()
-                    
-                    if existing_trade:
-                        continue
-                    
-                    # Create new trade
-                    trade = Trade(
-                        filer_id=filer.filer_id,
-                        source=DataSource.SEC_EDGAR,
-                        source_id=trade_data.source_id,
-                        reported_date=trade_data.reported_date,
-                        trade_date=trade_data.trade_date,
-                        ticker=trade_data.ticker,
-                        company_name=trade_data.company_name,
-                        transaction_type=TransactionType(trade_data.transaction_type)
-                            if trade_data.transaction_type in [t.value for t in TransactionType]
-                            else TransactionType.BUY,
-                        quantity=trade_data.quantity,
-                        price=trade_data.price,
-                        amount_usd=trade_data.amount_usd,
-                        insider_relationship=trade_data.insider_relationship,
-                        filing_url=trade_data.filing_url,
-                        raw_data=trade_data.raw_data
+                        Trade.source_id.in_([t.source_id for t in trades])
                     )
-                    
-                    session.add(trade)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to save SEC trade: {e}")
-                    continue
-    
-    def _get_or_create_filer(self, session, trade_data: RawTradeData) -> Filer:
-        """Get or create filer from trade data."""
-        
-        filer = session.query(Filer).filter(
-            Filer.name == trade_data.filer_name,
-            Filer.filer_type == FilerType.CORPORATE_INSIDER
-        ).first()
-        
-        if not filer:
-            filer = Filer(
-                name=trade_data.filer_name,
-                filer_type=FilerType.CORPORATE_INSIDER,
-                company=trade_data.company_name,
-                title=trade_data.insider_relationship
+                }
+                
+                # Create trades with one Core executemany, bypassing the ORM unit of work
+                rows = [
+                    {
+                        'filer_id': filer_ids[trade_data.filer_name],
+                        'source': DataSource.SEC_EDGAR,
+                        'source_id': trade_data.source_id,
+                        'reported_date': trade_data.reported_date,
+                        'trade_date': trade_data.trade_date,
+                        'ticker': trade_data.ticker,
+                        'company_name': trade_data.company_name,
+                        'transaction_type': TransactionType(trade_data.transaction_type)
+                            if trade_data.transaction_type in _TRANSACTION_TYPE_VALUES
+                            else TransactionType.BUY,
+                        'quantity': trade_data.quantity,
+                        'price': trade_data.price,
+                        'amount_usd': trade_data.amount_usd,
+                        'insider_relationship': trade_data.insider_relationship,
+                        'filing_url': trade_data.filing_url,
+                        'raw_data': trade_data.raw_data
+                    }
+                    for trade_data in trades
+                    if trade_data.source_id not in existing
+                ]
+                # An empty parameter list would execute as a single all-default insert
+                if rows:
+                    session.execute(Trade.__table__.insert(), rows)
+                
+        except Exception as e:
+            self.logger.warning(f"Failed to save {len(trades)} SEC trades: {e}")
+            # Filers created in the rolled-back transaction are gone
+            self._filer_cache.clear()
+    
+    def _get_filer_ids(self, session, trades: List[RawTradeData]) -> Dict[str, int]:
+        """Get or create the filers of a batch of trades.
+        
+        Filers already seen this run come from the cache; the rest are looked
+        up with one query, and missing ones are created with a single flush.
+        
+        Returns:
+            Dict mapping filer name to filer_id
+        """
+        
+        filer_type = FilerType.CORPORATE_INSIDER
+        filer_ids = {}
+        missing = set()
+        for trade_data in trades:
+            filer_id = self._filer_cache.get((trade_data.filer_name, filer_type))
+            if filer_id is None:
+                missing.add(trade_data.filer_name)
+            else:
+                filer_ids[trade_data.filer_name] = filer_id
+        
+        if not missing:
+            return filer_ids
+        
+        filer_ids.update(
+            session.query(Filer.name, Filer.filer_id).filter(
+                Filer.name.in_(missing),
+                Filer.filer_type == filer_type
             )
-            session.add(filer)
+        )
+        
+        new_filers = {}
+        for trade_data in trades:
+            if trade_data.filer_name not in filer_ids and trade_data.filer_name not in new_filers:
+                new_filers[trade_data.filer_name] = Filer(
+                    name=trade_data.filer_name,
+                    filer_type=filer_type,
+                    company=trade_data.company_name,
+                    title=trade_data.insider_relationship
+                )
+        
+        if new_filers:
+            session.add_all(new_filers.values())
             session.flush()
+            filer_ids.update((f.name, f.filer_id) for f in new_filers.values())
         
-        return filer
-
+        self._filer_cache.update(((name, filer_type), filer_id) for name, filer_id in filer_ids.items())
+        return filer_ids
 
 if __name__ == "__main__":
     import argparse
@@ -525,4 +726,7 @@ if __name__ == "__main__":
     scraper = SECScraper()
     results = scraper.run_full_ingestion(days=args.days)
     
-    print(json.dumps(results, indent=2, default=str))
+    if ORJSON_AVAILABLE:
+        print(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str).decode())
+    else:
+        print(json.dumps(results, indent=2, default=str))
@@ -2,19 +2,70 @@
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Iterator
-from decimal import Decimal
 
 import requests
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
+import lxml.html
+from lxml import etree
 
 from config.config import config
 from src.database import get_session, Filer, Trade, FilerType, TransactionType, DataSource
 from .base import ScrapingIngester, RawTradeData, IngestionError
 
 
+# Filing pages downloaded and parsed concurrently
+MAX_FILING_WORKERS = 8
+
+# On-disk cache lifetimes (seconds). Filed reports are immutable; the search
+# results listing changes as new reports are received.
+FILING_CACHE_TTL = 365 * 24 * 3600
+LISTING_CACHE_TTL = 600
+
+# Rows of the first search results table (class "table"), minus the header
+_RESULT_ROWS_XPATH = etree.XPath(
+    "(//table[contains(concat(' ', normalize-space(@class), ' '), ' table ')])[1]"
+    "/descendant::tr[position() > 1]"
+)
+
+# Rows of a filing's transaction table, minus the header
+_DATA_ROWS_XPATH = etree.XPath('descendant::tr[position() > 1]')
+
+# First link to the XML version of a filing
+_XML_LINK_XPATH = etree.XPath(
+    r"//a[re:test(@href, '\.xml$')]",
+    namespaces={'re': 'http://exslt.org/regular-expressions'}
+)
+
+# Ticker in parentheses after an asset name, e.g. "Apple Inc. (AAPL)"
+_TICKER_RE = re.compile(r'\(([A-Z]{1,5})\)')
+_TICKER_STRIP_RE = re.compile(r'\s*\([A-Z]{1,5}\)')
+
+# Amount ranges such as "$15,001 - $50,000", once stripped to "15001-50000";
+# other whitespace (newlines from pretty-printed XML, nbsp) may remain around the dash
+_AMOUNT_STRIP = str.maketrans('', '', '$, ')
+_RANGE_RE = re.compile(r'([\d.]+)\s*-\s*([\d.]+)')
+
+
+@lru_cache(maxsize=64)
+def _classify_transaction(trans_type: str) -> str:
+    """Map a filing's transaction type text to a TransactionType name.
+    
+    Filings use a handful of distinct strings, so results are cached.
+    """
+    trans_type_lower = trans_type.lower()
+    if 'purchase' in trans_type_lower or 'buy' in trans_type_lower:
+        return 'BUY'
+    elif 'sale' in trans_type_lower or 'sell' in trans_type_lower:
+        return 'SELL'
+    elif 'exchange' in trans_type_lower:
+        return 'EXCHANGE'
+    else:
+        return 'OTHER'
+
+
 class SenateXMLScraper(ScrapingIngester):
     """Scraper for Senate eFilings XML feed - periodic transaction reports."""
     
@@ -24,9 +75,20 @@ class SenateXMLScraper(ScrapingIngester):
             base_url="https://efdsearch.senate.gov"
         )
         
+        # Filer name -> filer_id, so each senator is looked up once per run
+        self._filer_cache: Dict[str, int] = {}
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
     def fetch_recent_trades(self, days: int = 30) -> Iterator[RawTradeData]:
         """Fetch recent senator trading disclosures."""
         
+        for trades in self._fetch_recent_filing_trades(days):
+            yield from trades
+    
+    def _fetch_recent_filing_trades(self, days: int) -> Iterator[List[RawTradeData]]:
+        """Fetch recent disclosures, yielding each filing's trades as one list."""
+        
         # Senate search page
         search_url = f"{self.base_url}/search/"
         
@@ -34,10 +96,10 @@ class SenateXMLScraper(ScrapingIngester):
             # Get recent PTR (Periodic Transaction Report) filings
             filings = self._search_recent_filings(days)
             
-            for filing in filings:
-                trades = self._parse_filing(filing)
-                for trade in trades:
-                    yield trade
+            # Filing pages are independent, so fetch several at once; the
+            # shared rate limiter still spaces out request starts
+            with ThreadPoolExecutor(max_workers=MAX_FILING_WORKERS) as executor:
+                yield from executor.map(self._parse_filing, filings)
                     
         except Exception as e:
             self.logger.error(f"Failed to fetch Senate filings: {e}")
@@ -64,29 +126,26 @@ class SenateXMLScraper(ScrapingIngester):
         }
         
         try:
-            response = self.session.post(search_url, data=payload, timeout=30)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Re-runs within LISTING_CACHE_TTL reuse the last results page
+            with self._open_cached(search_url, LISTING_CACHE_TTL, payload, self._post_form) as f:
+                tree = lxml.html.parse(f)
             
             # Parse results table
-            table = soup.find('table', {'class': 'table'})
-            if table:
-                rows = table.find_all('tr')[1:]  # Skip header
-                
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) >= 4:
-                        # Extract filing info
-                        name_cell = cols[0]
-                        date_cell = cols[1]
-                        link_cell = cols[3]
-                        
-                        link = link_cell.find('a')
-                        if link and link.get('href'):
-                            filings.append({
-                                'name': name_cell.text.strip(),
-                                'date': date_cell.text.strip(),
-                                'url': self.base_url + link['href']
-                            })
+            for row in _RESULT_ROWS_XPATH(tree):
+                cols = row.findall('.//td')
+                if len(cols) >= 4:
+                    # Extract filing info
+                    name_cell = cols[0]
+                    date_cell = cols[1]
+                    link_cell = cols[3]
+                    
+                    link = link_cell.find('.//a')
+                    if link is not None and link.get('href'):
+                        filings.append({
+                            'name': name_cell.text_content().strip(),
+                            'date': date_cell.text_content().strip(),
+                            'url': self.base_url + link.get('href')
+                        })
             
             self.logger.info(f"Found {len(filings)} Senate PTR filings")
             
@@ -101,31 +160,27 @@ class SenateXMLScraper(ScrapingIngester):
         trades = []
         
         try:
-            response = self._make_request(filing['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with self._open_cached(filing['url'], FILING_CACHE_TTL) as f:
+                doc = lxml.html.parse(f).getroot()
             
             # Senate filings may have structured data or be PDFs
             # Look for transaction tables
-            tables = soup.find_all('table')
-            
-            for table in tables:
+            for table in doc.iter('table'):
                 # Look for transaction table (contains Asset, Type, Date, Amount columns)
-                headers = [th.text.strip().lower() for th in table.find_all('th')]
+                headers = [th.text_content().strip().lower() for th in table.iter('th')]
                 
                 if any(h in headers for h in ['asset', 'ticker', 'transaction']):
-                    rows = table.find_all('tr')[1:]  # Skip header
-                    
-                    for row in rows:
-                        cols = row.find_all('td')
+                    for row in _DATA_ROWS_XPATH(table):
+                        cols = [td.text_content().strip() for td in row.iter('td')]
                         if len(cols) >= 4:
                             trade_data = self._parse_transaction_row(cols, filing)
                             if trade_data:
                                 trades.append(trade_data)
             
             # Also check for XML data in the page
-            xml_link = soup.find('a', href=re.compile(r'\.xml$'))
-            if xml_link:
-                xml_url = self.base_url + xml_link['href']
+            xml_links = _XML_LINK_XPATH(doc)
+            if xml_links:
+                xml_url = self.base_url + xml_links[0].get('href')
                 xml_trades = self._parse_xml_filing(xml_url, filing)
                 trades.extend(xml_trades)
             
@@ -134,37 +189,29 @@ class SenateXMLScraper(ScrapingIngester):
         
         return trades
     
-    def _parse_transaction_row(self, cols: List, filing: Dict) -> Optional[RawTradeData]:
-        """Parse a transaction row from Senate filing table."""
+    def _parse_transaction_row(self, cols: List[str], filing: Dict) -> Optional[RawTradeData]:
+        """Parse a transaction row (its stripped cell texts) from Senate filing table."""
         
         try:
             # Common column patterns:
             # Asset/Security | Type | Date | Amount | Ticker
             
-            asset_name = cols[0].text.strip() if len(cols) > 0 else ''
-            trans_type = cols[1].text.strip() if len(cols) > 1 else ''
-            trans_date = cols[2].text.strip() if len(cols) > 2 else ''
-            amount = cols[3].text.strip() if len(cols) > 3 else ''
-            ticker = cols[4].text.strip() if len(cols) > 4 else ''
+            asset_name = cols[0] if len(cols) > 0 else ''
+            trans_type = cols[1] if len(cols) > 1 else ''
+            trans_date = cols[2] if len(cols) > 2 else ''
+            amount = cols[3] if len(cols) > 3 else ''
+            ticker = cols[4] if len(cols) > 4 else ''
             
             # Extract ticker if not in separate column
             if not ticker:
                 # Look for ticker in parentheses
-                match = re.search(r'\(([A-Z]{1,5})\)', asset_name)
+                match = _TICKER_RE.search(asset_name)
                 if match:
                     ticker = match.group(1)
-                    asset_name = re.sub(r'\s*\([A-Z]{1,5}\)', '', asset_name)
+                    asset_name = _TICKER_STRIP_RE.sub('', asset_name)
             
             # Parse transaction type
-            trans_type_lower = trans_type.lower()
-            if 'purchase' in trans_type_lower or 'buy' in trans_type_lower:
-                transaction_type = 'BUY'
-            elif 'sale' in trans_type_lower or 'sell' in trans_type_lower:
-                transaction_type = 'SELL'
-            elif 'exchange' in trans_type_lower:
-                transaction_type = 'EXCHANGE'
-            else:
-                transaction_type = 'OTHER'
+            transaction_type = _classify_transaction(trans_type)
             
             # Parse amount (often ranges like "$15,001 - $50,000")
             amount_value = self._parse_amount_range(amount)
@@ -203,66 +250,80 @@ class SenateXMLScraper(ScrapingIngester):
         trades = []
         
         try:
-            response = self._make_request(xml_url)
-            root = ET.fromstring(response.text)
+            # Invariant across every transaction of the filing
+            filer_name = filing['name']
+            reported_date = datetime.strptime(filing['date'], '%m/%d/%Y').date()
             
-            # XML structure varies, look for transaction elements
-            for trans in root.findall('.//Transaction'):
-                asset = trans.find('AssetName')
-                ticker_elem = trans.find('Ticker')
-                trans_type = trans.find('TransactionType')
-                trans_date = trans.find('TransactionDate')
-                amount = trans.find('Amount')
-                
-                if asset is not None:
-                    ticker = ticker_elem.text if ticker_elem is not None else ''
+            with self._open_cached(xml_url, FILING_CACHE_TTL) as f:
+                # XML structure varies, look for transaction elements; they are
+                # parsed incrementally and freed once read, so memory stays
+                # flat however many transactions a filing has
+                for _, trans in etree.iterparse(f, events=('end',), tag='Transaction'):
+                    asset = trans.find('AssetName')
+                    ticker_elem = trans.find('Ticker')
+                    trans_type = trans.find('TransactionType')
+                    trans_date = trans.find('TransactionDate')
+                    amount = trans.find('Amount')
+                    
+                    if asset is not None:
+                        ticker = (ticker_elem.text or '') if ticker_elem is not None else ''
+                        trans_date_text = (trans_date.text or '') if trans_date is not None else ''
+                        
+                        trade_data = RawTradeData(
+                            source="senate_xml",
+                            source_id="_".join(("senate_xml", filer_name, ticker, trans_date_text)),
+                            reported_date=reported_date,
+                            trade_date=datetime.strptime(trans_date_text, '%Y-%m-%d').date() if trans_date is not None else date.today(),
+                            ticker=ticker.upper() if ticker else asset.text[:10].upper(),
+                            company_name=asset.text,
+                            filer_name=filer_name,
+                            filer_type=FilerType.POLITICIAN.value,
+                            transaction_type='BUY' if trans_type is not None and 'purchase' in trans_type.text.lower() else 'SELL',
+                            amount_usd=self._parse_amount_range(amount.text) if amount is not None else 0,
+                            raw_data={
+                                'source': 'senate_xml',
+                                'filing_url': filing['url']
+                            }
+                        )
+                        trades.append(trade_data)
                     
-                    trade_data = RawTradeData(
-                        source="senate_xml",
-                        source_id=f"senate_xml_{filing['name']}_{ticker}_{trans_date.text if trans_date is not None else ''}",
-                        reported_date=datetime.strptime(filing['date'], '%m/%d/%Y').date(),
-                        trade_date=datetime.strptime(trans_date.text, '%Y-%m-%d').date() if trans_date is not None else date.today(),
-                        ticker=ticker.upper() if ticker else asset.text[:10].upper(),
-                        company_name=asset.text,
-                        filer_name=filing['name'],
-                        filer_type=FilerType.POLITICIAN.value,
-                        transaction_type='BUY' if trans_type is not None and 'purchase' in trans_type.text.lower() else 'SELL',
-                        amount_usd=self._parse_amount_range(amount.text) if amount is not None else 0,
-                        raw_data={
-                            'source': 'senate_xml',
-                            'filing_url': filing['url']
-                        }
-                    )
-                    trades.append(trade_data)
+                    trans.clear()
+                    while trans.getprevious() is not None:
+                        del trans.getparent()[0]
             
         except Exception as e:
             self.logger.warning(f"Failed to parse XML filing: {e}")
         
         return trades
     
+    def _post_form(self, url: str, headers: Dict[str, str], payload: Dict) -> requests.Response:
+        """Stream a form POST; the request callable for _open_cached."""
+        
+        self.stats["requests_made"] += 1
+        response = self.session.post(url, data=payload, headers=headers, timeout=30, stream=True)
+        response.raise_for_status()
+        return response
+    
     def _parse_amount_range(self, amount_str: str) -> float:
         """Parse amount range (e.g., '$15,001 - $50,000') to midpoint."""
         
         if not amount_str:
             return 0
         
-        # Remove $ and commas
-        amount_str = amount_str.replace('$', '').replace(',', '')
+        # Remove $, commas and spaces in one pass
+        amount_str = amount_str.strip().translate(_AMOUNT_STRIP)
         
-        # Check for range
-        if '-' in amount_str:
-            parts = amount_str.split('-')
-            try:
-                low = float(parts[0].strip())
-                high = float(parts[1].strip())
-                return (low + high) / 2
-            except:
-                return 0
-        
-        # Single value
         try:
-            return float(amount_str.strip())
-        except:
+            # Check for range
+            if '-' in amount_str:
+                match = _RANGE_RE.match(amount_str)
+                if not match:
+                    return 0
+                return (float(match.group(1)) + float(match.group(2))) * 0.5
+            
+            # Single value
+            return float(amount_str)
+        except ValueError:
             return 0
     
     def fetch_historical_trades(self, start_date: date, end_date: date) -> Iterator[RawTradeData]:
@@ -281,20 +342,28 @@ class SenateXMLScraper(ScrapingIngester):
         start_time = datetime.now()
         self.logger.info(f"Starting {self.name} ingestion")
         
+        self._filer_cache.clear()
+        
         try:
             trades_collected = 0
             trades_processed = 0
             errors = 0
             
-            for trade_data in self.fetch_recent_trades(days):
-                trades_processed += 1
+            # One transaction per filing rather than per trade
+            for trades in self._fetch_recent_filing_trades(days):
+                if not trades:
+                    continue
+                
+                trades_processed += len(trades)
                 
                 try:
-                    self._save_trade(trade_data)
-                    trades_collected += 1
+                    self._save_trades_batch(trades)
+                    trades_collected += len(trades)
                 except Exception as e:
-                    self.logger.warning(f"Failed to save trade: {e}")
-                    errors += 1
+                    self.logger.warning(f"Failed to save {len(trades)} trades: {e}")
+                    errors += len(trades)
+                    # Filers created in the rolled-back transaction are gone
+                    self._filer_cache.clear()
             
             end_time = datetime.now()
             runtime = (end_time - start_time).total_seconds()
@@ -315,49 +384,66 @@ class SenateXMLScraper(ScrapingIngester):
             self.logger.error(f"Ingestion failed: {e}")
             raise IngestionError(f"Senate XML ingestion failed: {e}")
     
-    def _save_trade(self, trade_data: RawTradeData):
-        """Save trade to database."""
+    def _save_trades_batch(self, trades: List[RawTradeData]):
+        """Save a filing's trades to database in a single transaction.
+        
+        One filer query, one existence query and one bulk insert, instead of
+        a session, several queries and a commit per trade.
+        """
         
         with get_session() as session:
-            # Get or create filer
-            filer = session.query(Filer).filter(Filer.name == trade_data.filer_name).first()
+            # Get or create filers not seen earlier in the run
+            names = {t.filer_name for t in trades} - self._filer_cache.keys()
+            filer_ids = self._filer_cache
+            if names:
+                filer_ids.update(
+                    session.query(Filer.name, Filer.filer_id).filter(Filer.name.in_(names))
+                )
             
-            if not filer:
-                filer = Filer(
-                    name=trade_data.filer_name,
+            new_filers = [
+                Filer(
+                    name=name,
                     filer_type=FilerType.POLITICIAN,
                     chamber='Senate'
                 )
-                session.add(filer)
+                for name in names - filer_ids.keys()
+            ]
+            if new_filers:
+                session.add_all(new_filers)
                 session.flush()
+                filer_ids.update((f.name, f.filer_id) for f in new_filers)
             
-            # Check if exists
-            existing = session.query(Trade).filter(
-                Trade.source == DataSource.SCRAPED,
-                Trade.source_id == trade_data.source_id
-            ).first()
-            
-            if existing:
-                return
+            # Check which trades exist
+            existing = {
+                source_id for (source_id,) in session.query(Trade.source_id).filter(
+                    Trade.source == DataSource.SCRAPED,
+                    Trade.source_id.in_({t.source_id for t in trades})
+                )
+            }
             
-            # Create trade
-            trade = Trade(
-                filer_id=filer.filer_id,
-                source=DataSource.SCRAPED,
-                source_id=trade_data.source_id,
-                reported_date=trade_data.reported_date,
-                trade_date=trade_data.trade_date,
-                ticker=trade_data.ticker,
-                company_name=trade_data.company_name,
-                transaction_type=TransactionType[trade_data.transaction_type],
-                amount_usd=Decimal(str(trade_data.amount_usd)) if trade_data.amount_usd else None,
-                filing_url=trade_data.raw_data.get('filing_url'),
-                raw_data=trade_data.raw_data
-            )
+            # Rows repeated within a filing share a source_id; keep the first
+            new_trades = {}
+            for trade_data in trades:
+                if trade_data.source_id not in existing:
+                    new_trades.setdefault(trade_data.source_id, trade_data)
             
-            session.add(trade)
-            session.commit()
-
+            # Create trades
+            session.bulk_insert_mappings(Trade, [
+                {
+                    'filer_id': filer_ids[trade_data.filer_name],
+                    'source': DataSource.SCRAPED,
+                    'source_id': trade_data.source_id,
+                    'reported_date': trade_data.reported_date,
+                    'trade_date': trade_data.trade_date,
+                    'ticker': trade_data.ticker,
+                    'company_name': trade_data.company_name,
+                    'transaction_type': TransactionType[trade_data.transaction_type],
+                    'amount_usd': trade_data.amount_usd or None,
+                    'filing_url': trade_data.raw_data.get('filing_url'),
+                    'raw_data': trade_data.raw_data
+                }
+                for trade_data in new_trades.values()
+            ])
 
 def main():
     """Test Senate XML scraper."""
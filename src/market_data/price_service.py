@@ -6,30 +6,48 @@ Provides price context for insider trades.
 """
 
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
 import yfinance as yf
+from cachetools import TTLCache
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched price stays fresh
+CACHE_TTL = 15 * 60
+
+# Shared by every PriceService, since callers (e.g. the Flask routes) create
+# one per request; TTLCache is not thread-safe, hence the lock
+_price_cache = TTLCache(maxsize=10_000, ttl=CACHE_TTL)
+_price_cache_lock = threading.Lock()
+
+# Daily history DataFrames by (ticker, period), guarded by the same lock
+_history_cache = TTLCache(maxsize=2000, ttl=CACHE_TTL)
+
+# Dates this recent are looked up in the cached one-month history
+RECENT_DATE_WINDOW = pd.Timedelta(days=25)
+
 
 class PriceService:
     """Manages price data and comparisons."""
     
     def __init__(self):
-        self.cache = {}  # Simple in-memory cache
-        self.cache_duration = timedelta(minutes=15)
+        self.cache = _price_cache
+        self._cache_lock = _price_cache_lock
     
     def get_current_price(self, ticker: str) -> Optional[Dict]:
         """Get current price and basic info."""
         cache_key = f"{ticker}_current"
         
         # Check cache
-        if cache_key in self.cache:
-            cached_data, cached_time = self.cache[cache_key]
-            if datetime.now() - cached_time < self.cache_duration:
-                return cached_data
+        with self._cache_lock:
+            cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         try:
             stock = yf.Ticker(ticker)
@@ -90,7 +108,8 @@ class PriceService:
             }
             
             # Cache it
-            self.cache[cache_key] = (data, datetime.now())
+            with self._cache_lock:
+                self.cache[cache_key] = data
             
             return data
             
@@ -98,29 +117,46 @@ class PriceService:
             logger.error(f"Error getting current price for {ticker}: {e}")
             return None
     
+    def _get_history(self, ticker: str, period: str) -> pd.DataFrame:
+        """Get daily price history, cached per (ticker, period).
+        
+        The DataFrame is shared between callers and must not be modified.
+        """
+        cache_key = (ticker, period)
+        
+        with self._cache_lock:
+            hist = _history_cache.get(cache_key)
+        if hist is not None:
+            return hist
+        
+        hist = yf.Ticker(ticker).history(period=period)
+        
+        # Empty frames usually mean a transient failure; let the next call retry
+        if not hist.empty:
+            with self._cache_lock:
+                _history_cache[cache_key] = hist
+        return hist
+    
     def get_price_at_date(self, ticker: str, date: datetime) -> Optional[float]:
         """Get historical price at a specific date."""
         try:
-            stock = yf.Ticker(ticker)
-            
-            # Get a range around the date
-            start = date - timedelta(days=5)
-            end = date + timedelta(days=5)
-            
-            hist = stock.history(start=start, end=end)
+            if pd.Timestamp.now() - pd.Timestamp(date) < RECENT_DATE_WINDOW:
+                # Recent dates are covered by the cached one-month history
+                hist = self._get_history(ticker, '1mo')
+            else:
+                # Get a range around the date
+                start = date - timedelta(days=5)
+                end = date + timedelta(days=5)
+                
+                hist = yf.Ticker(ticker).history(start=start, end=end)
             
             if hist.empty:
                 return None
             
-            # Try to get exact date, or closest
-            date_str = date.strftime('%Y-%m-%d')
-            
-            if date_str in hist.index.strftime('%Y-%m-%d'):
-                idx = hist.index.strftime('%Y-%m-%d').tolist().index(date_str)
-                return float(hist['Close'].iloc[idx])
-            
-            # Return closest date
-            return float(hist['Close'].iloc[0])
+            # Exact date if it was a trading day, otherwise the closest one
+            price_dates = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+            idx = price_dates.get_indexer([pd.Timestamp(date).normalize()], method='nearest')[0]
+            return float(hist['Close'].iat[idx])
             
         except Exception as e:
             logger.error(f"Error getting historical price for {ticker} at {date}: {e}")
@@ -188,39 +224,40 @@ class PriceService:
             period: '1mo', '3mo', '6mo', '1y', '2y', '5y'
         """
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
+            hist = self._get_history(ticker, period)
             
             if hist.empty:
                 return {'error': 'No price data available'}
             
-            # Format price data
-            price_data = []
-            for date, row in hist.iterrows():
-                price_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume'])
-                })
+            # Format price data (to_dict boxes values as Python floats/ints)
+            price_data = pd.DataFrame({
+                'date': hist.index.strftime('%Y-%m-%d'),
+                'open': hist['Open'].astype('float64'),
+                'high': hist['High'].astype('float64'),
+                'low': hist['Low'].astype('float64'),
+                'close': hist['Close'].astype('float64'),
+                'volume': hist['Volume'].astype('int64')
+            }).to_dict('records')
+            
+            # Match each trade to the nearest trading day within 3 days, all
+            # in one binary-search lookup on the (sorted) price index
+            trade_dates = pd.to_datetime([trade['date'] for trade in trades], errors='coerce')
+            price_dates = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+            
+            positions = np.full(len(trade_dates), -1)
+            has_date = trade_dates.notna()
+            if has_date.any():
+                positions[has_date] = price_dates.get_indexer(
+                    trade_dates[has_date], method='nearest', tolerance=pd.Timedelta(days=3)
+                )
+            closes = hist['Close'].to_numpy()
             
-            # Match trades to price data
             trade_markers = []
-            for trade in trades:
-                trade_date = trade['date'] if isinstance(trade['date'], datetime) else datetime.strptime(trade['date'], '%Y-%m-%d')
-                
-                # Find closest price data point
-                closest_price = None
-                for p in price_data:
-                    p_date = datetime.strptime(p['date'], '%Y-%m-%d')
-                    if abs((p_date - trade_date).days) <= 3:
-                        closest_price = p['close']
-                        break
+            for trade, trade_date, position in zip(trades, trade_dates, positions):
+                closest_price = float(closes[position]) if position != -1 else None
                 
                 trade_markers.append({
-                    'date': trade_date.strftime('%Y-%m-%d'),
+                    'date': trade_date.strftime('%Y-%m-%d') if pd.notna(trade_date) else None,
                     'type': trade.get('type', 'BUY'),
                     'price': trade.get('price', closest_price),
                     'amount': trade.get('amount', 0),
@@ -237,9 +274,9 @@ class PriceService:
                 'price_data': price_data,
                 'trade_markers': trade_markers,
                 'stats': {
-                    'high': max([p['high'] for p in price_data]),
-                    'low': min([p['low'] for p in price_data]),
-                    'avg_volume': sum([p['volume'] for p in price_data]) / len(price_data)
+                    'high': float(hist['High'].max()),
+                    'low': float(hist['Low'].min()),
+                    'avg_volume': float(hist['Volume'].mean())
                 }
             }
             
@@ -271,15 +308,82 @@ class PriceService:
                 return f"Current price is {diff_pct:.1f}% HIGHER than insider's price - may want to wait for pullback"
     
     def get_batch_prices(self, tickers: List[str]) -> Dict[str, Dict]:
-        """Get current prices for multiple tickers."""
+        """Get current prices for multiple tickers.
+        
+        Tickers not in the cache are fetched with a single yf.download call,
+        which downloads them concurrently. Prices come from daily bars only,
+        and market_cap is None; use get_market_cap() where it is needed.
+        """
         results = {}
+        missing = []
+        
+        with self._cache_lock:
+            for ticker in dict.fromkeys(tickers):
+                cached_data = self.cache.get(f"{ticker}_current")
+                if cached_data is not None:
+                    results[ticker] = cached_data
+                else:
+                    missing.append(ticker)
+        
+        if missing:
+            try:
+                data = yf.download(missing, period='5d', group_by='ticker',
+                                   threads=True, progress=False)
+            except Exception as e:
+                logger.error(f"Error getting batch prices for {len(missing)} tickers: {e}")
+                data = pd.DataFrame()
+            
+            for ticker in missing:
+                if data.empty:
+                    break
+                
+                try:
+                    hist = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                except KeyError:
+                    continue
+                
+                hist = hist.dropna(subset=['Close'])
+                if hist.empty:
+                    continue
+                
+                current_price = float(hist['Close'].iloc[-1])
+                prev_close = float(hist['Close'].iloc[-2]) if len(hist) >= 2 else current_price
+                change = current_price - prev_close
+                change_pct = (change / prev_close * 100) if prev_close != 0 else 0
+                volume = hist['Volume'].iloc[-1]
+                
+                results[ticker] = {
+                    'ticker': ticker,
+                    'current_price': current_price,
+                    'price': current_price,
+                    'prev_close': prev_close,
+                    'change': round(change, 2),
+                    'change_percent': round(change_pct, 2),
+                    'change_pct': round(change_pct, 2),
+                    'volume': int(volume) if pd.notna(volume) else 0,
+                    'market_cap': None,
+                    'timestamp': datetime.now().isoformat()
+                }
+        
+        return {ticker: results[ticker] for ticker in tickers if ticker in results}
+    
+    def get_market_cap(self, ticker: str) -> Optional[int]:
+        """Get market capitalization, via the (slow) yfinance info endpoint."""
+        cache_key = f"{ticker}_market_cap"
+        
+        with self._cache_lock:
+            if cache_key in self.cache:
+                return self.cache[cache_key]
         
-        for ticker in tickers:
-            data = self.get_current_price(ticker)
-            if data:
-                results[ticker] = data
+        try:
+            market_cap = yf.Ticker(ticker).info.get('marketCap')
+        except Exception as e:
+            logger.error(f"Error getting market cap for {ticker}: {e}")
+            return None
         
-        return results
+        with self._cache_lock:
+            self.cache[cache_key] = market_cap
+        return market_cap
     
     def calculate_entry_quality(self, ticker: str, trades: List[Dict]) -> Dict:
         """
@@ -294,17 +398,17 @@ class PriceService:
         
         current_price = current_data['current_price']
         
-        trade_prices = []
-        for trade in trades:
-            if trade.get('price'):
-                trade_prices.append(float(trade['price']))
+        trade_prices = np.fromiter(
+            (float(trade['price']) for trade in trades if trade.get('price')),
+            dtype=np.float64
+        )
         
-        if not trade_prices:
+        if not trade_prices.size:
             return {'error': 'No trade prices available'}
         
-        avg_insider_price = sum(trade_prices) / len(trade_prices)
-        min_insider_price = min(trade_prices)
-        max_insider_price = max(trade_prices)
+        avg_insider_price = float(trade_prices.mean())
+        min_insider_price = float(trade_prices.min())
+        max_insider_price = float(trade_prices.max())
         
         # Calculate scores
         vs_avg = ((current_price - avg_insider_price) / avg_insider_price) * 100
@@ -334,7 +438,7 @@ class PriceService:
             'vs_max_pct': vs_max,
             'entry_score': round(entry_score, 1),
             'entry_rating': self._get_entry_rating(entry_score),
-            'num_insider_trades': len(trade_prices),
+            'num_insider_trades': int(trade_prices.size),
             'recommendation': self._get_entry_recommendation(entry_score, vs_avg)
         }
     
@@ -3,7 +3,7 @@
 
 from datetime import datetime, timedelta
 from src.database import get_session, Trade, Filer
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 
 def test_stats():
     """Test stats generation."""
@@ -12,18 +12,23 @@ def test_stats():
         # Count trades by type
         from src.database.models import FilerType
         
+        # All counts in one pass over trades; filers (including those with
+        # no trades) are counted in a scalar subquery of the same statement
+        cutoff = datetime.now().date() - timedelta(days=30)
+        counts = session.query(
+            func.count(Trade.trade_id),
+            select(func.count(Filer.filer_id)).scalar_subquery(),
+            func.sum(case((Filer.filer_type == FilerType.POLITICIAN, 1), else_=0)),
+            func.sum(case((Filer.filer_type == FilerType.CORPORATE_INSIDER, 1), else_=0)),
+            func.sum(case((Trade.reported_date >= cutoff, 1), else_=0))
+        ).select_from(Trade).outerjoin(Filer).one()
+        
         stats = {
-            'total_trades': session.query(Trade).count(),
-            'total_filers': session.query(Filer).count(),
-            'politician_trades': session.query(Trade).join(Filer).filter(
-                Filer.filer_type == FilerType.POLITICIAN
-            ).count(),
-            'insider_trades': session.query(Trade).join(Filer).filter(
-                Filer.filer_type == FilerType.CORPORATE_INSIDER
-            ).count(),
-            'recent_trades': session.query(Trade).filter(
-                Trade.reported_date >= datetime.now().date() - timedelta(days=30)
-            ).count()
+            'total_trades': counts[0],
+            'total_filers': counts[1],
+            'politician_trades': counts[2] or 0,
+            'insider_trades': counts[3] or 0,
+            'recent_trades': counts[4] or 0
         }
         
         # Top tickers